@@ -23,10 +23,10 @@ if st.checkbox("Show/Hide"):
     st.text("Showing something")
 
 # Working with Beta Expander
-# if st.beta_expander("Python"):
+# if st.expander("Python"):
 #     st.success("Hello Python")
 
-with st.beta_expander("Julia"):
+with st.expander("Julia"):
     st.text("Hello Julia")
 
 # Select/Multiple select
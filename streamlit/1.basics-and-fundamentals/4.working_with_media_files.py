@@ -6,7 +6,7 @@ import streamlit as st
 
 from PIL import Image
 img = Image.open("data/image_03.jpg")
-st.image(img, use_column_width=True)
+st.image(img, width="stretch")
 
 # From URL
 st.image("https://media.istockphoto.com/photos/innovation-and-science-concept-picture-id1177116437")
@@ -10,7 +10,7 @@ import plotly.express as px
 matplotlib.use("Agg")
 
 
-@st.cache
+@st.cache_data
 def load_data(data):
     df = pd.read_csv(data)
     return df
@@ -26,25 +26,25 @@ def run_eda_app():
     if submenu == "Descriptive":
         st.dataframe(df)
 
-        with st.beta_expander("Data Types"):
+        with st.expander("Data Types"):
             st.dataframe(df.dtypes)
 
-        with st.beta_expander("Descriptive Summary"):
+        with st.expander("Descriptive Summary"):
             st.dataframe(df_encoded.describe())
 
-        with st.beta_expander("Class Distribution"):
+        with st.expander("Class Distribution"):
             st.dataframe(df['class'].value_counts())
 
-        with st.beta_expander("Gender Distribution"):
+        with st.expander("Gender Distribution"):
             st.dataframe(df['Gender'].value_counts())
     elif submenu == "Plots":
         st.subheader("Plots")
 
-        col1, col2 = st.beta_columns([2, 1])
+        col1, col2 = st.columns([2, 1])
 
         with col1:
             # For Gender Distribution
-            with st.beta_expander("Dist Plot of Gender"):
+            with st.expander("Dist Plot of Gender"):
                 # fig = plt.figure()
                 # sns.countplot(df['Gender'])
                 # st.pyplot(fig)
@@ -59,20 +59,20 @@ def run_eda_app():
                 st.plotly_chart(p1, use_container_width=True)
 
             # For Class Distribution
-            with st.beta_expander("Dist Plot of Class"):
+            with st.expander("Dist Plot of Class"):
                 fig = plt.figure()
                 sns.countplot(df['class'])
                 st.pyplot(fig)
 
             with col2:
-                with st.beta_expander("Gender Distribution"):
+                with st.expander("Gender Distribution"):
                     st.dataframe(gen_df)
 
-                with st.beta_expander("Class Distribution"):
+                with st.expander("Class Distribution"):
                     st.dataframe(df['class'].value_counts())
 
             # Freq Dist
-            with st.beta_expander("Frequency Dist of Age"):
+            with st.expander("Frequency Dist of Age"):
                 # st.dataframe(freq_df)
                 p2 = px.bar(data_frame=freq_df,
                             x='Age',
@@ -80,14 +80,14 @@ def run_eda_app():
                 st.plotly_chart(p2, use_container_width=True)
 
             # Outlier Detection
-            with st.beta_expander("Outlier Detection Plot"):
+            with st.expander("Outlier Detection Plot"):
                 p3 = px.box(data_frame=df,
                             x='Age',
                             color='Gender')
                 st.plotly_chart(p3, use_container_width=True)
 
             # Correlation
-            with st.beta_expander("Correlation Plot"):
+            with st.expander("Correlation Plot"):
                 corr_matrix = df_encoded.corr()
                 fig = plt.figure(figsize=(20, 10))
                 sns.heatmap(corr_matrix, annot=True)
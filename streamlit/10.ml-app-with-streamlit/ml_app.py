@@ -45,7 +45,7 @@ def get_value(val, my_dict):
             return value
 
 
-@st.cache
+@st.cache_resource
 def load_model(model_file):
     loaded_model = joblib.load(open(os.path.join(model_file), "rb"))
     return loaded_model
@@ -54,10 +54,10 @@ def load_model(model_file):
 def run_ml_app():
     st.subheader("ML Prediction")
 
-    with st.beta_expander("Attribute Info"):
+    with st.expander("Attribute Info"):
         st.markdown(attrib_info)
 
-    col1, col2 = st.beta_columns(2)
+    col1, col2 = st.columns(2)
     with col1:
         age = st.number_input("Age", value=10, min_value=10, max_value=100)
         gender = st.radio("Gender", options=["Female", "Male"])
@@ -78,7 +78,7 @@ def run_ml_app():
         alopecia = st.radio("alopecia", ["No", "Yes"])
         obesity = st.select_slider("obesity", ["No", "Yes"])
 
-    with st.beta_expander("Your Selected Options"):
+    with st.expander("Your Selected Options"):
         result = {
             'age': age,
             'gender': gender,
@@ -112,7 +112,7 @@ def run_ml_app():
 
         st.write(encoded_result)
 
-    with st.beta_expander("Prediction Result"):
+    with st.expander("Prediction Result"):
         single_sample = np.array(encoded_result).reshape(1, -1)
         # st.write(single_sample)
 
@@ -1,31 +1,35 @@
 import streamlit as st
 
 # File Processing Packages
+import io
 from PIL import Image
 import pandas as pd
 import docx2txt
 # import textract
-from PyPDF2 import PdfFileReader
 import pdfplumber
+from pdf_utils import read_pdf
+from filecache_utils import get_extraction_cache
 
 
 # Loading Images
-
-@st.cache
+# Image.open only parses the header, so there is nothing worth caching and
+# no need to hash the whole upload object on every rerun
 def load_image(image_file):
-    img = Image.open(image_file)
+    img = Image.open(io.BytesIO(image_file.getvalue()))
     return img
 
 
-def read_pdf(file):
-    pdfReader = PdfFileReader(file)
-    count = pdfReader.numPages
-    all_page_text = ""
-    for i in range(count):
-        page = pdfReader.getPage(i)
-        all_page_text += page.extractText()
+# Function to extract the text of a PDF or DOCX upload, once per content hash
+def extract_document_text(docx_file, max_pages=None):
+    def extract(data):
+        if docx_file.type == "application/pdf":
+            return read_pdf(io.BytesIO(data), last_page=max_pages)
+        return docx2txt.process(io.BytesIO(data))
 
-    return all_page_text
+    return get_extraction_cache().get_or_extract(
+        "text-{}-{}".format(docx_file.type, max_pages),
+        docx_file.getvalue(),
+        extract)
 
 
 def main():
@@ -72,6 +76,8 @@ def main():
         st.subheader("DocumentFiles")
         docx_file = st.file_uploader(label="Upload Document",
                                      type=["pdf", "docx", "txt"])
+        max_pages = st.number_input(label="PDF pages to read (0 = all)",
+                                    min_value=0, value=0)
 
         if st.button("Process"):
             if docx_file is not None:
@@ -102,12 +108,13 @@ def main():
                     # except:
                     #     st.write("None")
 
-                    # using PyPDF
-                    raw_text = read_pdf(docx_file)
+                    # using PyPDF, pages are read one at a time
+                    raw_text = extract_document_text(docx_file,
+                                                     max_pages or None)
                     st.write(raw_text)
 
                 else:
-                    raw_text = docx2txt.process(docx_file)
+                    raw_text = extract_document_text(docx_file)
                     st.write(raw_text)  # works
                     # st.text(raw_text) # works
 
@@ -2,11 +2,12 @@
 import streamlit as st
 
 # Additional Packages / Summarization Packages
-from gensim.summarization import summarize
-# LexRank Algorithm
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lex_rank import LexRankSummarizer
+import os
+import time
+from summarizer_utils import (SUMMARIZERS, batch_summarize, flatten_scores,
+                              get_sentence_scores, run_summaries,
+                              sweep_summary_lengths)
+from store_utils import get_summary_store
 
 # EDA Packages
 import pandas as pd
@@ -19,32 +20,44 @@ import matplotlib
 
 matplotlib.use("Agg")  # TkAgg # Backend
 
-# Evaluate Summary
-from rouge import Rouge
 
+# Function to show a summary and its Rouge Score
+def show_summary(raw_text, my_summary, eval_df):
+    document_len = {
+        "Original": len(raw_text),
+        "Summary": len(my_summary)
+    }
+    st.write(document_len)
+    st.write(my_summary)
 
-# Function for LexRank Summarization
-# Function for Sumy Summarization
-def sumy_summarizer(docx, num=2):
-    parser = PlaintextParser.from_string(docx, Tokenizer("english"))
-    lex_summarizer = LexRankSummarizer()
-    summary = lex_summarizer(parser.document, num)
-    summary_list = [str(sentence) for sentence in summary]
-    result = ' '.join(summary_list)
-    return result
+    st.info("Rouge Score")
+    st.dataframe(eval_df.T)
 
+    eval_df['metrics'] = eval_df.index
+    c = alt.Chart(eval_df).mark_bar().encode(
+        x='metrics',
+        y='rouge-1'
+    )
+    st.altair_chart(c)
 
-def evaluate_summary(summary, reference):
-    r = Rouge()
-    eval_score = r.get_scores(summary, reference)
-    eval_score_df = pd.DataFrame(eval_score[0])
-    return eval_score_df
+
+# Function to read the .txt files of a folder as (name, text) pairs
+def read_text_folder(folder):
+    for filename in sorted(os.listdir(folder)):
+        path = os.path.join(folder, filename)
+        if filename.endswith(".txt") and os.path.isfile(path):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                yield filename, f.read()
+
+
+# Seconds between two redraws of the batch results table
+TABLE_REFRESH_SECONDS = 0.5
 
 
 def main():
     """A Simple Summarization NLP Application"""
     st.title("Summarizer App")
-    menu = ["Home", "About"]
+    menu = ["Home", "Batch", "Sweep", "About"]
 
     choice = st.sidebar.selectbox(label="Menu",
                                   options=menu)
@@ -53,51 +66,108 @@ def main():
         st.subheader("Summarization")
         raw_text = st.text_area("Enter Text Here")
         if st.button("Summarize"):
-            with st.beta_expander("Original Text"):
+            with st.expander("Original Text"):
                 st.write(raw_text)
 
             # Layout
-            c1, c2 = st.beta_columns(2)
-            with c1:
-                with st.beta_expander("LexRank Summary"):
-                    my_summary = sumy_summarizer(raw_text)
-                    document_len = {
-                        "Original": len(raw_text),
-                        "Summary": len(my_summary)
-                    }
-                    st.write(document_len)
-                    st.write(my_summary)
-
-                    st.info("Rouge Score")
-                    eval_df = evaluate_summary(my_summary, raw_text)
-                    st.dataframe(eval_df.T)
-
-                    eval_df['metrics'] = eval_df.index
-                    c = alt.Chart(eval_df).mark_bar().encode(
-                        x='metrics',
-                        y='rouge-1'
-                    )
-                    st.altair_chart(c)
-
-            with c2:
-                with st.beta_expander("TextRank Summary"):
-                    my_summary = summarize(text=raw_text)
-                    document_len = {
-                        "Original": len(raw_text),
-                        "Summary": len(my_summary)
-                    }
-                    st.write(document_len)
-                    st.write(my_summary)
-                    evaluate_summary(my_summary, raw_text)
-                    st.info("Rouge Score")
-                    eval_df = evaluate_summary(my_summary, raw_text)
-                    st.dataframe(eval_df.T)
-                    eval_df['metrics'] = eval_df.index
-                    c = alt.Chart(eval_df).mark_bar().encode(
-                        x='metrics',
-                        y='rouge-1'
-                    )
-                    st.altair_chart(c)
+            c1, c2 = st.columns(2)
+            columns = {"LexRank": c1, "TextRank": c2}
+            placeholders = {}
+            for algorithm, column in columns.items():
+                with column:
+                    placeholders[algorithm] = st.empty()
+                    placeholders[algorithm].info(
+                        "Running {}...".format(algorithm))
+
+            # Both summarizers run in worker processes, each column is
+            # filled as soon as its own result is ready
+            results = run_summaries(raw_text, list(columns))
+            for algorithm, my_summary, eval_df, error in results:
+                if error is not None:
+                    placeholders[algorithm].error(
+                        "{} failed: {}".format(algorithm, error))
+                    continue
+                with placeholders[algorithm].container():
+                    with st.expander("{} Summary".format(algorithm)):
+                        show_summary(raw_text, my_summary, eval_df)
+
+    elif choice == "Batch":
+        st.subheader("Batch Summarization")
+        uploaded_files = st.file_uploader("Upload Documents", type=["txt"],
+                                          accept_multiple_files=True)
+        folder = st.text_input("Or a folder of .txt files on the server")
+        algorithms = st.multiselect("Algorithms", list(SUMMARIZERS),
+                                    default=list(SUMMARIZERS))
+
+        if st.button("Summarize All"):
+            named_texts = [
+                (f.name, f.getvalue().decode("utf-8", errors="replace"))
+                for f in uploaded_files or []
+            ]
+            if folder:
+                if os.path.isdir(folder):
+                    named_texts.extend(read_text_folder(folder))
+                else:
+                    st.warning("Folder not found: {}".format(folder))
+            if not named_texts or not algorithms:
+                st.info("Add documents and pick at least one algorithm.")
+                return
+
+            total = len(named_texts) * len(algorithms)
+            progress_bar = st.progress(0)
+            status = st.empty()
+            table = st.empty()
+            rows = []
+            last_refresh = 0.0
+            # Rows stream in as workers finish, stored results come first
+            results = batch_summarize(named_texts, algorithms,
+                                      get_summary_store())
+            for name, algorithm, summary, scores, cached, error in results:
+                row = {"Document": name, "Algorithm": algorithm}
+                row.update(flatten_scores(scores))
+                row.update({"Summary Words": len(summary.split()),
+                            "Cached": cached, "Summary": summary,
+                            "Error": error})
+                rows.append(row)
+                progress_bar.progress(len(rows) / total)
+                status.text("{} / {} summaries".format(len(rows), total))
+                if time.monotonic() - last_refresh > TABLE_REFRESH_SECONDS:
+                    table.dataframe(pd.DataFrame(rows))
+                    last_refresh = time.monotonic()
+            table.dataframe(pd.DataFrame(rows))
+
+    elif choice == "Sweep":
+        st.subheader("Summary Length Sweep")
+        raw_text = st.text_area("Enter Text Here")
+        mode = st.radio("Length", ["Sentences", "Ratio"])
+        if raw_text.strip():
+            # LexRank scores are computed once per text, every length and
+            # every rerun reuses them
+            sentences, _, _ = get_sentence_scores(raw_text)
+            num_sentences = max(len(sentences), 1)
+            if mode == "Sentences":
+                low, high = st.slider("Sentences", 1, num_sentences,
+                                      (1, min(num_sentences, 10)))
+                sweep_df = sweep_summary_lengths(
+                    raw_text, lengths=range(low, high + 1))
+            else:
+                low, high = st.slider("Ratio", 0.05, 1.0, (0.05, 0.5),
+                                      step=0.05)
+                steps = int(round((high - low) / 0.05)) + 1
+                ratios = [low + 0.05 * i for i in range(steps)]
+                sweep_df = sweep_summary_lengths(raw_text, ratios=ratios)
+
+            if not sweep_df.empty:
+                metrics = [c for c in sweep_df.columns if c.startswith("rouge")]
+                chart_df = sweep_df.melt(id_vars=[mode], value_vars=metrics,
+                                         var_name="metric", value_name="f")
+                c = alt.Chart(chart_df).mark_line(point=True).encode(
+                    x=mode,
+                    y='f',
+                    color='metric'
+                )
+                st.altair_chart(c, use_container_width=True)
+                st.dataframe(sweep_df)
 
     else:
         st.subheader("About")
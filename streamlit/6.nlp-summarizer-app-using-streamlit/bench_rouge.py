@@ -0,0 +1,85 @@
+"""Benchmark rouge_utils against the rouge package.
+
+Scores many extractive candidate summaries against one reference with both
+implementations, reports the largest score difference and the time each
+one takes. The reference is a seeded synthetic document unless a text file
+is given.
+
+    python bench_rouge.py
+    python bench_rouge.py --reference article.txt --candidates 200
+"""
+
+import argparse
+import random
+import time
+
+from rouge import Rouge
+
+from rouge_utils import RougeEvaluator
+
+
+def make_document(num_sentences, seed=0):
+    """Function to build a reproducible document with a Zipf-like vocabulary"""
+    rng = random.Random(seed)
+    vocab = ["word{}".format(i) for i in range(2000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    sentences = [
+        " ".join(rng.choices(vocab, weights, k=rng.randint(5, 30)))
+        for _ in range(num_sentences)
+    ]
+    return ". ".join(sentences) + "."
+
+
+def make_candidates(reference, num_candidates, seed=0):
+    """Function to pick random sentence subsets of the reference as summaries"""
+    rng = random.Random(seed)
+    sentences = [s for s in reference.split(".") if s.strip()]
+    candidates = []
+    for _ in range(num_candidates):
+        size = rng.randint(1, max(1, len(sentences) // 10))
+        picked = sorted(rng.sample(range(len(sentences)), size))
+        candidates.append(".".join(sentences[i] for i in picked) + ".")
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reference", help="text file used as the reference")
+    parser.add_argument("--sentences", type=int, default=300)
+    parser.add_argument("--candidates", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.reference:
+        with open(args.reference, encoding="utf-8") as f:
+            reference = f.read()
+    else:
+        reference = make_document(args.sentences)
+    candidates = make_candidates(reference, args.candidates)
+
+    start = time.perf_counter()
+    expected = [Rouge().get_scores(c, reference)[0] for c in candidates]
+    rouge_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = RougeEvaluator(reference).score_many(candidates)
+    fast_seconds = time.perf_counter() - start
+
+    max_diff = max(
+        abs(e[metric][stat] - a[metric][stat])
+        for e, a in zip(expected, actual)
+        for metric in e
+        for stat in e[metric]
+    )
+    print(
+        "Candidates: {}, reference words: {}".format(
+            len(candidates), len(reference.split())
+        )
+    )
+    print("Max score difference: {:.3g}".format(max_diff))
+    print("rouge package: {:8.3f} s".format(rouge_seconds))
+    print("rouge_utils:   {:8.3f} s".format(fast_seconds))
+    print("Speedup:       {:8.1f}x".format(rouge_seconds / fast_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Benchmark textrank_utils against gensim.summarization.
+
+Summarizes a fixed corpus of seeded synthetic documents with both
+implementations and reports their throughput. Documents are drawn from real
+English words, so after preprocessing every sentence is a distinct graph
+node; the number of nodes is printed to check that. Quality parity is checked with
+ROUGE: each summary is scored against its document, and the built-in summary
+is also scored against the legacy one. The legacy side needs gensim < 4, and
+only the built-in summarizer is timed when it is missing.
+
+    python bench_textrank.py
+    python bench_textrank.py --documents 20 --sentences 500 --ratio 0.1
+"""
+
+import argparse
+import random
+import time
+
+from rouge_utils import get_rouge_evaluator
+from textrank_utils import bag_of_words, preprocess, split_sentences, summarize
+
+# Content words of the corpus. Letters only, since preprocessing strips
+# digits, and chosen so the Porter stemmer keeps them apart
+VOCABULARY = """
+account action advice agency agent anchor animal answer apple area army art
+article artist attack audience author baby bank battle beach bird blood board
+boat body bone book border bottle brain branch bread bridge brother budget
+building camera campaign cancer captain card career castle cattle century
+chair chance channel chapter charge cheese chicken child church circle city
+climate clock cloud coach coast coffee college colour comfort committee
+company compass concert contract corner cotton council country county court
+cousin crowd culture customer damage danger daughter debate decade defence
+desert design dolphin device diamond dinner doctor dollar door dream driver
+economy editor effort election energy engine error evening event evidence
+factory family farmer father feature field figure finger falcon flight floor
+flower forest fortune freedom friend fruit future garden garlic gate ghost
+glass glove gold government grain grass guest guitar habit hammer harbour
+health heart height hero highway history holiday honey horse hospital hotel
+house hunger husband island jacket journal journey judge jungle justice
+kitchen knife ladder lake language lawyer leader lesson letter library
+license lion liquid market meadow member memory merchant message metal method
+middle minister mirror model monkey morning mother motor mountain mouse
+museum music nation nature needle neighbour network newspaper night novel
+number ocean office orbit orange orchard painter palace paper parent
+patient pattern peace pencil pepper pilot planet plant player pocket poem
+police potato powder prison problem product profit project property puzzle
+queen question rabbit railway rainbow reader record region report river road
+rocket roof rubber saddle sailor salad scholar school science season
+secret senator shadow sheep shelter shirt shoulder signal silver singer
+sister skill soldier speaker spirit spring square stadium station stomach
+storm story stranger street student studio sugar summer supper surface
+sword symbol table tailor teacher temple tennis theatre thunder ticket tiger
+timber tomato tongue tower trader traffic train treasure tree trial truck
+tunnel uncle valley village violin visitor voice volcano wagon wallet water
+weapon weather wedding whale window winter witness woman wood worker writer
+yard youth zebra
+""".split()
+
+# Function words mixed into sentences, removed again by preprocessing
+FUNCTION_WORDS = "the a of and to in on with for from by at".split()
+
+
+def make_document(num_sentences, seed=0):
+    """Function to build a reproducible document with a Zipf-like vocabulary"""
+    rng = random.Random(seed)
+    vocab = VOCABULARY[:]
+    rng.shuffle(vocab)
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    sentences = []
+    for _ in range(num_sentences):
+        words = rng.choices(vocab, weights, k=rng.randint(5, 30))
+        for _ in range(len(words) // 3):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(FUNCTION_WORDS))
+        sentences.append(" ".join(words).capitalize())
+    return ". ".join(sentences) + "."
+
+
+def count_nodes(docx):
+    """Function to get the number of distinct sentence nodes TextRank builds"""
+    return len(
+        {bag_of_words(preprocess(sentence)) for sentence in split_sentences(docx)}
+    )
+
+
+def load_legacy_summarize():
+    """Function to get gensim's summarize, or None when gensim >= 4 or missing"""
+    try:
+        from gensim.summarization import summarize as legacy_summarize
+    except ImportError:
+        return None
+    return legacy_summarize
+
+
+def run(summarizer, corpus, ratio):
+    start = time.perf_counter()
+    summaries = [summarizer(docx, ratio=ratio) for docx in corpus]
+    return summaries, time.perf_counter() - start
+
+
+def mean_f(scores, metric):
+    return sum(score[metric]["f"] for score in scores) / len(scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=10)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    corpus = [make_document(args.sentences, seed) for seed in range(args.documents)]
+    summaries, seconds = run(summarize, corpus, args.ratio)
+    scores = [
+        get_rouge_evaluator(docx).score(summary)
+        for docx, summary in zip(corpus, summaries)
+    ]
+    print(
+        "Documents: {}, sentences each: {}, ratio: {}".format(
+            args.documents, args.sentences, args.ratio
+        )
+    )
+    print(
+        "Distinct sentence nodes per document: {:.1f}".format(
+            sum(count_nodes(docx) for docx in corpus) / len(corpus)
+        )
+    )
+    print(
+        "textrank_utils: {:8.3f} s  {:8.1f} docs/s  rouge-1 f {:.4f}  rouge-l f {:.4f}".format(
+            seconds,
+            len(corpus) / seconds,
+            mean_f(scores, "rouge-1"),
+            mean_f(scores, "rouge-l"),
+        )
+    )
+
+    legacy_summarize = load_legacy_summarize()
+    if legacy_summarize is None:
+        print("gensim.summarization not available (needs gensim < 4), skipped.")
+        return
+
+    legacy_summaries, legacy_seconds = run(legacy_summarize, corpus, args.ratio)
+    legacy_scores = [
+        get_rouge_evaluator(docx).score(summary)
+        for docx, summary in zip(corpus, legacy_summaries)
+    ]
+    agreement = [
+        get_rouge_evaluator(legacy).score(summary)
+        for legacy, summary in zip(legacy_summaries, summaries)
+    ]
+    identical = sum(a == b for a, b in zip(summaries, legacy_summaries))
+    print(
+        "gensim:         {:8.3f} s  {:8.1f} docs/s  rouge-1 f {:.4f}  rouge-l f {:.4f}".format(
+            legacy_seconds,
+            len(corpus) / legacy_seconds,
+            mean_f(legacy_scores, "rouge-1"),
+            mean_f(legacy_scores, "rouge-l"),
+        )
+    )
+    print("Identical summaries: {} / {}".format(identical, len(corpus)))
+    print(
+        "Agreement with gensim: rouge-1 f {:.4f}  rouge-l f {:.4f}".format(
+            mean_f(agreement, "rouge-1"), mean_f(agreement, "rouge-l")
+        )
+    )
+    print("Speedup:        {:8.1f}x".format(legacy_seconds / seconds))
+
+
+if __name__ == "__main__":
+    main()
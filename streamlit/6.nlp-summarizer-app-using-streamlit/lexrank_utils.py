@@ -0,0 +1,144 @@
+# LexRank Packages
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+from sumy.nlp.tokenizers import Tokenizer
+from sumy.parsers.plaintext import PlaintextParser
+from sumy.utils import get_stop_words
+
+# Same settings as sumy's LexRankSummarizer
+THRESHOLD = 0.1
+EPSILON = 0.1
+
+# Rows of the similarity matrix computed per sparse product
+SIMILARITY_BLOCK_SIZE = 1024
+
+
+def tfidf_matrix(sentences_words):
+    """Function to build the sparse TF-IDF matrix (sentences x terms).
+
+    TF is the term count divided by the sentence's largest count, IDF is
+    log(N / (1 + df)), as in sumy.
+    """
+    vocab = {}
+    rows, cols, tfs = [], [], []
+    for row, words in enumerate(sentences_words):
+        counts = Counter(words)
+        if not counts:
+            continue
+        max_count = max(counts.values())
+        for term, count in counts.items():
+            rows.append(row)
+            cols.append(vocab.setdefault(term, len(vocab)))
+            tfs.append(count / max_count)
+
+    cols = np.array(cols, dtype=np.int64)
+    document_freq = np.bincount(cols, minlength=len(vocab))
+    with np.errstate(divide="ignore"):
+        idf = np.log(len(sentences_words) / (1 + document_freq))
+    weights = np.array(tfs) * idf[cols]
+    return sparse.csr_matrix(
+        (weights, (rows, cols)), shape=(len(sentences_words), len(vocab))
+    )
+
+
+def similarity_graph(matrix, threshold=THRESHOLD):
+    """Function to get the row-normalized LexRank graph of a TF-IDF matrix.
+
+    Cosine similarities come from sparse products of row blocks with the
+    whole matrix. Only the edges above threshold are kept, so memory grows
+    with the number of edges, not with the number of sentence pairs.
+    """
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    unit_rows = sparse.diags(inverse_norms) @ matrix
+    unit_rows_t = unit_rows.T.tocsc()
+
+    blocks = []
+    for start in range(0, matrix.shape[0], SIMILARITY_BLOCK_SIZE):
+        similarities = unit_rows[start : start + SIMILARITY_BLOCK_SIZE] @ unit_rows_t
+        blocks.append((similarities > threshold).astype(np.float64))
+    adjacency = sparse.vstack(blocks).tocsr()
+
+    degrees = np.asarray(adjacency.sum(axis=1)).ravel()
+    degrees[degrees == 0] = 1
+    return sparse.diags(1.0 / degrees) @ adjacency
+
+
+def power_method(graph, epsilon=EPSILON):
+    """Function to get the stationary scores of the graph, as in sumy"""
+    graph_t = graph.T.tocsr()
+    scores = np.full(graph.shape[0], 1.0 / graph.shape[0])
+    change = 1.0
+    while change > epsilon:
+        next_scores = graph_t @ scores
+        next_scores /= np.linalg.norm(next_scores)
+        change = np.linalg.norm(next_scores - scores)
+        scores = next_scores
+    return scores
+
+
+class LexRankEngine:
+    """LexRank summarizer with a resident tokenizer and stop word list.
+
+    Sentence splitting and word normalization are sumy's, the similarity
+    graph and power iteration run on sparse matrices. Picks the same
+    sentences as sumy's LexRankSummarizer with the same stop words.
+    """
+
+    def __init__(self, language="english", use_stop_words=False):
+        self.tokenizer = Tokenizer(language)
+        self.stop_words = frozenset()
+        if use_stop_words:
+            self.stop_words = frozenset(w.lower() for w in get_stop_words(language))
+
+    def split(self, docx):
+        """Return the sentence texts and the normalized words of each one"""
+        document = PlaintextParser.from_string(docx, self.tokenizer).document
+        sentences = [str(sentence) for sentence in document.sentences]
+        sentences_words = [
+            [w.lower() for w in sentence.words if w.lower() not in self.stop_words]
+            for sentence in document.sentences
+        ]
+        return sentences, sentences_words
+
+    def score_sentences(self, docx):
+        """Return the sentence texts and their LexRank scores"""
+        sentences, sentences_words = self.split(docx)
+        if not sentences:
+            return [], np.empty(0)
+        graph = similarity_graph(tfidf_matrix(sentences_words))
+        scores = power_method(graph)
+        # sumy rates sentences through a dict, so repeated sentences share
+        # the score of their last occurrence
+        rating = dict(zip(sentences, scores))
+        return sentences, np.array([rating[s] for s in sentences])
+
+    def summarize(self, docx, num=2):
+        sentences, scores = self.score_sentences(docx)
+        return select_sentences(sentences, scores, num)
+
+
+def rank_order(scores):
+    """Function to get the sentence indexes from best to worst score"""
+    # A stable sort keeps ties in document order, as sumy does
+    return np.argsort(-scores, kind="stable")
+
+
+def select_sentences(sentences, scores, num, order=None):
+    """Function to join the num best scored sentences in document order.
+
+    Pass the rank_order of the scores to pick many lengths from one sort.
+    """
+    if order is None:
+        order = rank_order(scores)
+    best = sorted(order[:num])
+    return " ".join(sentences[i] for i in best)
+
+
+@lru_cache(maxsize=4)
+def get_lexrank_engine(language="english", use_stop_words=False):
+    """Function to get a resident LexRankEngine"""
+    return LexRankEngine(language, use_stop_words)
@@ -0,0 +1,198 @@
+# Evaluation Packages
+from functools import lru_cache
+
+import numpy as np
+
+# Word IDs stay below 2**31, so a bigram ID (first << 31 | second) fits in int64
+WORD_ID_BITS = 31
+
+# Reference sentences whose LCS tables are computed together
+LCS_BLOCK_SIZE = 256
+
+
+def split_sentences(text):
+    """Function to split a text into sentences the same way as the rouge package"""
+    return [" ".join(sentence.split()) for sentence in text.split(".") if sentence]
+
+
+def _f_score(precision, recall):
+    return 2.0 * ((precision * recall) / (precision + recall + 1e-8))
+
+
+def _scores(overlap, hyp_count, ref_count):
+    precision = overlap / hyp_count if hyp_count else 0.0
+    recall = overlap / ref_count if ref_count else 0.0
+    return {"r": recall, "p": precision, "f": _f_score(precision, recall)}
+
+
+def _ngram_ids(word_ids, n):
+    """Function to get the sorted distinct n-gram IDs (n = 1 or 2) of a text"""
+    if n == 1:
+        return np.unique(word_ids)
+    if len(word_ids) < 2:
+        return np.empty(0, dtype=np.int64)
+    return np.unique((word_ids[:-1] << WORD_ID_BITS) | word_ids[1:])
+
+
+def _lcs_tables(refs, y):
+    """Function to get the LCS length tables of each row of refs against y.
+
+    refs is a 2D array of reference sentences padded with -1. Row i of all
+    tables is computed at once: a match extends the diagonal and a running
+    maximum carries values along the row. Padding never matches, so each
+    table keeps its final row past the end of its sentence.
+    """
+    num_refs, max_len = refs.shape
+    tables = np.zeros((num_refs, max_len + 1, len(y) + 1), dtype=np.int32)
+    for i in range(1, max_len + 1):
+        previous = tables[:, i - 1]
+        row = previous[:, 1:].copy()
+        matches = refs[:, i - 1, None] == y
+        row[matches] = previous[:, :-1][matches] + 1
+        tables[:, i, 1:] = np.maximum.accumulate(row, axis=1)
+    return tables
+
+
+def _lcs_words(table, x, y):
+    """Function to get the words of the LCS of x and y, backtracked like rouge"""
+    words = set()
+    i, j = len(x), len(y)
+    while i > 0 and j > 0:
+        if x[i - 1] == y[j - 1]:
+            words.add(x[i - 1])
+            i, j = i - 1, j - 1
+        elif table[i - 1][j] > table[i][j - 1]:
+            i -= 1
+        else:
+            j -= 1
+    return words
+
+
+class RougeEvaluator:
+    """ROUGE-1, ROUGE-2 and ROUGE-L of candidate summaries against one reference.
+
+    The reference is tokenized and its n-grams are turned into sorted integer
+    IDs once. Candidates are scored with NumPy set operations on those IDs.
+    Scores match the rouge package with its default settings.
+
+    Only reference words are kept in the vocabulary. Other candidate words
+    and the LCS cache live for one score_many call, so an evaluator kept by
+    get_rouge_evaluator does not grow with the candidates it scores.
+    """
+
+    def __init__(self, reference):
+        self._vocab = {}
+        ref_sentences = split_sentences(reference)
+        for sentence in ref_sentences:
+            for word in sentence.split(" "):
+                self._vocab.setdefault(word, len(self._vocab))
+
+        self.ref_sentences = [self._to_ids(sentence, {}) for sentence in ref_sentences]
+        if not self.ref_sentences:
+            raise ValueError("Reference is empty.")
+        self.ref_word_lists = [ids.tolist() for ids in self.ref_sentences]
+        self.ref_word_sets = [set(words) for words in self.ref_word_lists]
+        self.ref_lengths = np.array([len(ids) for ids in self.ref_sentences])
+        self.ref_matrix = np.full(
+            (len(self.ref_sentences), self.ref_lengths.max()), -1, dtype=np.int64
+        )
+        for k, ids in enumerate(self.ref_sentences):
+            self.ref_matrix[k, : len(ids)] = ids
+
+        ref_words = np.concatenate(self.ref_sentences)
+        self.ref_ngrams = {n: _ngram_ids(ref_words, n) for n in (1, 2)}
+
+    def _to_ids(self, sentence, new_words):
+        """Return the word IDs of a sentence.
+
+        Words not in the reference get IDs past the vocabulary, kept in
+        new_words.
+        """
+        ids = []
+        for word in sentence.split(" "):
+            word_id = self._vocab.get(word)
+            if word_id is None:
+                word_id = new_words.setdefault(word, len(self._vocab) + len(new_words))
+            ids.append(word_id)
+        return np.array(ids, dtype=np.int64)
+
+    def _rouge_l(self, hyp_sentences, hyp_words, lcs_cache):
+        union = set()
+        for hyp_sentence in hyp_sentences:
+            union |= self._sentence_lcs_words(hyp_sentence, lcs_cache)
+        return _scores(len(union), len(hyp_words), len(self.ref_ngrams[1]))
+
+    def _sentence_lcs_words(self, hyp_sentence, lcs_cache):
+        """Return the words of the LCS of a sentence with each reference one"""
+        hyp_word_list = hyp_sentence.tolist()
+        key = tuple(hyp_word_list)
+        words = lcs_cache.get(key)
+        if words is not None:
+            return words
+
+        words = set()
+        hyp_word_set = set(hyp_word_list)
+        # Sentences without a shared word have an empty LCS
+        shared = [
+            k
+            for k, ref_word_set in enumerate(self.ref_word_sets)
+            if not ref_word_set.isdisjoint(hyp_word_set)
+        ]
+        for start in range(0, len(shared), LCS_BLOCK_SIZE):
+            block = shared[start : start + LCS_BLOCK_SIZE]
+            refs = self.ref_matrix[block, : self.ref_lengths[block].max()]
+            tables = _lcs_tables(refs, hyp_sentence)
+            for k, table in zip(block, tables):
+                words |= _lcs_words(
+                    table.tolist(), self.ref_word_lists[k], hyp_word_list
+                )
+        words = frozenset(words)
+        lcs_cache[key] = words
+        return words
+
+    def score(self, candidate):
+        return self.score_many([candidate])[0]
+
+    def score_many(self, candidates):
+        """Return a rouge-package style score dict for each candidate"""
+        if not candidates:
+            return []
+        new_words = {}
+        # LCS words of each candidate sentence, shared by every candidate
+        # that contains it (e.g. summaries of several lengths)
+        lcs_cache = {}
+        hyps = []
+        for candidate in candidates:
+            sentences = [self._to_ids(s, new_words) for s in split_sentences(candidate)]
+            if not sentences:
+                raise ValueError("Hypothesis is empty.")
+            hyps.append((sentences, np.concatenate(sentences)))
+
+        overlaps, counts = {}, {}
+        for n in (1, 2):
+            hyp_ngrams = [_ngram_ids(words, n) for _, words in hyps]
+            owner = np.repeat(np.arange(len(hyps)), [len(ids) for ids in hyp_ngrams])
+            in_ref = np.isin(np.concatenate(hyp_ngrams), self.ref_ngrams[n])
+            overlaps[n] = np.bincount(owner, weights=in_ref, minlength=len(hyps))
+            counts[n] = np.bincount(owner, minlength=len(hyps))
+
+        results = []
+        for i, (sentences, words) in enumerate(hyps):
+            results.append(
+                {
+                    "rouge-{}".format(n): _scores(
+                        int(overlaps[n][i]), int(counts[n][i]), len(self.ref_ngrams[n])
+                    )
+                    for n in (1, 2)
+                }
+            )
+            results[-1]["rouge-l"] = self._rouge_l(
+                sentences, np.unique(words), lcs_cache
+            )
+        return results
+
+
+@lru_cache(maxsize=8)
+def get_rouge_evaluator(reference):
+    """Function to get the evaluator of a reference, built once per text"""
+    return RougeEvaluator(reference)
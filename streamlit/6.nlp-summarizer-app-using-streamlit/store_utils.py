@@ -0,0 +1,69 @@
+# Results Store Packages
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+
+# SQLite file of the stored summaries, set SUMMARY_STORE_PATH to change
+STORE_PATH = os.environ.get("SUMMARY_STORE_PATH", "summaries.db")
+
+
+def get_text_hash(my_text):
+    """Function to get a content hash of a text"""
+    return hashlib.blake2b(my_text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SummaryStore:
+    """Summaries and ROUGE scores persisted in SQLite.
+
+    Results are keyed by the content hash of the document and the algorithm,
+    so a document seen before, under any file name, is not summarized again.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries_table(content_hash TEXT,
+            algorithm TEXT, summary TEXT, scores TEXT,
+            PRIMARY KEY (content_hash, algorithm))
+            """)
+
+    def get(self, content_hash, algorithm):
+        """Return the stored (summary, scores), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                """
+            SELECT summary, scores FROM summaries_table
+            WHERE content_hash = ? AND algorithm = ?
+            """,
+                (content_hash, algorithm),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, content_hash, algorithm, summary, scores):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+            INSERT OR REPLACE INTO summaries_table(content_hash, algorithm,
+            summary, scores) VALUES (?, ?, ?, ?)
+            """,
+                (content_hash, algorithm, summary, json.dumps(scores)),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM summaries_table"
+            ).fetchone()[0]
+
+
+@lru_cache(maxsize=1)
+def get_summary_store():
+    """Function to get the resident SummaryStore of the app"""
+    return SummaryStore()
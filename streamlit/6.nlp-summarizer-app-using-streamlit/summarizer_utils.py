@@ -0,0 +1,210 @@
+# Summarization Packages
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+import pandas as pd
+
+# LexRank Algorithm
+from lexrank_utils import get_lexrank_engine, rank_order, select_sentences
+
+# TextRank Algorithm, a drop-in for gensim.summarization
+from textrank_utils import summarize
+
+# Evaluate Summary
+from rouge_utils import get_rouge_evaluator
+
+# Results Store
+from store_utils import get_text_hash
+
+# Worker processes kept for the summarizers, set SUMMARIZER_WORKERS to change
+MAX_WORKERS = int(os.environ.get("SUMMARIZER_WORKERS", 2))
+
+
+# Function for LexRank Summarization
+def sumy_summarizer(docx, num=2):
+    lex_summarizer = get_lexrank_engine("english")
+    result = lex_summarizer.summarize(docx, num)
+    return result
+
+
+@lru_cache(maxsize=8)
+def get_sentence_scores(docx):
+    """Function to get the LexRank sentences, scores and rank order of a text.
+
+    Computed once per text and shared by every summary length.
+    """
+    sentences, scores = get_lexrank_engine("english").score_sentences(docx)
+    return sentences, scores, rank_order(scores)
+
+
+def sweep_summary_lengths(docx, lengths=None, ratios=None):
+    """Function to get LexRank summaries and ROUGE scores for many lengths.
+
+    Lengths are sentence counts, ratios are fractions of the sentences.
+    Centrality is computed once, each length only picks a prefix of the
+    ranking, and all summaries are scored in one batch. Returns a DataFrame
+    with one row per length.
+    """
+    sentences, scores, order = get_sentence_scores(docx)
+    if lengths is None:
+        lengths = [max(1, round(ratio * len(sentences))) for ratio in ratios]
+    lengths = sorted(set(min(num, len(sentences)) for num in lengths if num > 0))
+    summaries = [select_sentences(sentences, scores, num, order) for num in lengths]
+    if not summaries:
+        return pd.DataFrame()
+
+    rows = []
+    evaluations = get_rouge_evaluator(docx).score_many(summaries)
+    for num, summary, eval_score in zip(lengths, summaries, evaluations):
+        row = {
+            "Sentences": num,
+            "Ratio": num / len(sentences),
+            "Words": len(summary.split()),
+        }
+        row.update(flatten_scores(eval_score))
+        row["Summary"] = summary
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+# Function for TextRank Summarization
+def textrank_summarizer(docx):
+    return summarize(text=docx)
+
+
+def evaluate_summary(summary, reference):
+    eval_score = get_rouge_evaluator(reference).score(summary)
+    eval_score_df = pd.DataFrame(eval_score)
+    return eval_score_df
+
+
+SUMMARIZERS = {
+    "LexRank": sumy_summarizer,
+    "TextRank": textrank_summarizer,
+}
+
+
+def summarize_and_evaluate(algorithm, docx):
+    """Function run in a worker: summarize the text and score the summary"""
+    summary = SUMMARIZERS[algorithm](docx)
+    return summary, evaluate_summary(summary, docx)
+
+
+def summarize_and_score(algorithm, docx):
+    """Function run in a worker: summarize the text and get its score dict"""
+    summary = SUMMARIZERS[algorithm](docx)
+    if not summary.strip():
+        return summary, {}
+    return summary, get_rouge_evaluator(docx).score(summary)
+
+
+@lru_cache(maxsize=1)
+def get_executor():
+    """Function to get the process pool shared by every rerun and session.
+
+    Workers keep their LexRank engines and ROUGE evaluators between jobs.
+    """
+    return ProcessPoolExecutor(max_workers=MAX_WORKERS)
+
+
+def reset_executor(executor):
+    """Function to drop a broken pool, so get_executor starts a new one"""
+    if get_executor() is executor:
+        get_executor.cache_clear()
+    executor.shutdown(wait=False)
+
+
+def get_live_executor():
+    """Function to get the shared pool, replacing it if it broke unseen.
+
+    A worker can crash in a run that stopped before reading its results,
+    which leaves a pool whose submit raises BrokenProcessPool.
+    """
+    executor = get_executor()
+    try:
+        executor.submit(int)
+    except BrokenProcessPool:
+        reset_executor(executor)
+        executor = get_executor()
+    return executor
+
+
+def get_error_message(error, executor):
+    """Function to describe a failed job, replacing the pool if it broke"""
+    if isinstance(error, BrokenProcessPool):
+        reset_executor(executor)
+    return "{}: {}".format(type(error).__name__, error)
+
+
+def run_summaries(docx, algorithms):
+    """Function to run each summarizer on its own worker.
+
+    Yields (algorithm, summary, eval_df, error) as each one finishes. A
+    summarizer that fails, e.g. TextRank on a one-sentence text, gets an
+    empty summary, no eval_df and the error message, and the others still
+    yield their results.
+    """
+    executor = get_live_executor()
+    futures = {
+        executor.submit(summarize_and_evaluate, algorithm, docx): algorithm
+        for algorithm in algorithms
+    }
+    for future in as_completed(futures):
+        try:
+            summary, eval_df = future.result()
+        except Exception as e:
+            yield futures[future], "", None, get_error_message(e, executor)
+        else:
+            yield futures[future], summary, eval_df, None
+
+
+def batch_summarize(named_texts, algorithms, store):
+    """Function to summarize many documents with each algorithm.
+
+    Yields (name, algorithm, summary, scores, cached, error) as results come
+    in. Results already in the store come first, documents with the same
+    content are summarized once, and the others run on the process pool and
+    are written to the store as they finish. A job that fails, e.g. TextRank
+    on a one-sentence document, gets an empty summary and the error message,
+    is not stored, and does not stop the other jobs.
+    """
+    names_by_hash = {}
+    texts_by_hash = {}
+    for name, docx in named_texts:
+        content_hash = get_text_hash(docx)
+        names_by_hash.setdefault(content_hash, []).append(name)
+        texts_by_hash.setdefault(content_hash, docx)
+
+    executor = get_live_executor()
+    futures = {}
+    for content_hash, docx in texts_by_hash.items():
+        for algorithm in algorithms:
+            result = store.get(content_hash, algorithm)
+            if result is not None:
+                for name in names_by_hash[content_hash]:
+                    yield (name, algorithm) + result + (True, None)
+            else:
+                future = executor.submit(summarize_and_score, algorithm, docx)
+                futures[future] = (content_hash, algorithm)
+
+    for future in as_completed(futures):
+        content_hash, algorithm = futures[future]
+        try:
+            summary, scores = future.result()
+        except Exception as e:
+            summary, scores = "", {}
+            error = get_error_message(e, executor)
+        else:
+            error = None
+            store.put(content_hash, algorithm, summary, scores)
+        for name in names_by_hash[content_hash]:
+            yield name, algorithm, summary, scores, False, error
+
+
+def flatten_scores(scores):
+    """Function to turn a rouge score dict into one row of F-scores"""
+    return {
+        "{} f".format(metric): stats["f"] for metric, stats in sorted(scores.items())
+    }
@@ -0,0 +1,257 @@
+# TextRank Packages
+import re
+import string
+
+import numpy as np
+from nltk.stem.porter import PorterStemmer
+from scipy import sparse
+
+# Same settings as gensim.summarization (gensim < 4)
+INPUT_MIN_LENGTH = 10
+WEIGHT_THRESHOLD = 1.0e-3
+DAMPING = 0.85
+
+# BM25 parameters of gensim.summarization.bm25
+PARAM_K1 = 1.5
+PARAM_B = 0.75
+EPSILON = 0.25
+
+# PageRank stops when the L1 change of the scores falls below this
+PAGERANK_TOLERANCE = 1.0e-12
+PAGERANK_MAX_ITER = 1000
+
+# Sentence splitting of gensim.summarization.textcleaner
+SEPARATOR = r"@"
+RE_SENTENCE = re.compile(r"(\S.+?[.!?])(?=\s+|$)|(\S.+?)(?=[\n]|$)", re.UNICODE)
+AB_SENIOR = re.compile(r"([A-Z][a-z]{1,2}\.)\s(\w)", re.UNICODE)
+AB_ACRONYM = re.compile(r"(\.[a-zA-Z]\.)\s(\w)", re.UNICODE)
+UNDO_AB_SENIOR = re.compile(r"([A-Z][a-z]{1,2}\.)" + SEPARATOR + r"(\w)", re.UNICODE)
+UNDO_AB_ACRONYM = re.compile(r"(\.[a-zA-Z]\.)" + SEPARATOR + r"(\w)", re.UNICODE)
+
+# Token filters of gensim.parsing.preprocessing
+RE_TAGS = re.compile(r"<([^>]+)>", re.UNICODE)
+RE_PUNCT = re.compile(r"([%s])+" % re.escape(string.punctuation), re.UNICODE)
+RE_WHITESPACE = re.compile(r"(\s)+", re.UNICODE)
+RE_NUMERIC = re.compile(r"[0-9]+", re.UNICODE)
+
+STOPWORDS = frozenset("""
+    all six just less being indeed over move anyway four not own through using
+    fify where mill only find before one whose system how somewhere much thick
+    show had enough should to must whom seeming yourselves under ours two has
+    might thereafter latterly do them his around than get very de none cannot
+    every un they front during thus now him nor name regarding several hereafter
+    did always who didn whither this someone either each become thereupon
+    sometime side towards therein twelve because often ten our doing km eg some
+    back used up go namely computer are further beyond ourselves yet out even
+    will what still for bottom mine since please forty per its everything behind
+    does various above between it neither seemed ever across she somehow be we
+    full never sixty however here otherwise were whereupon nowhere although
+    found alone re along quite fifteen by both about last would anything via
+    many could thence put against keep etc amount became ltd hence onto or con
+    among already co afterwards formerly within seems into others while whatever
+    except down hers everyone done least another whoever moreover couldnt
+    throughout anyhow yourself three from her few together top there due been
+    next anyone eleven cry call therefore interest then thru themselves hundred
+    really sincere empty more himself elsewhere mostly on fire am becoming
+    hereby amongst else part everywhere too kg herself former those he me
+    myself made twenty these was bill cant us until besides nevertheless below
+    anywhere nine can whether of your toward my say something and whereafter
+    whenever give almost wherever is describe beforehand herein doesn an as
+    itself at have in seem whence ie any fill again hasnt inc thereby thin no
+    perhaps latter meanwhile when detail same wherein beside also that other
+    take which becomes you if nobody unless whereas see though may after upon
+    most hereupon eight but serious nothing such why off a don whereby third i
+    whole noone sometimes well amoungst yours their rather without so five the
+    first with make once
+    """.split())
+
+_stemmer = PorterStemmer(mode=PorterStemmer.MARTIN_EXTENSIONS)
+_stems = {}
+
+
+def _stem(word):
+    stem = _stems.get(word)
+    if stem is None:
+        stem = _stems[word] = _stemmer.stem(word)
+    return stem
+
+
+def split_sentences(text):
+    """Function to split a text into sentences, keeping abbreviations whole"""
+    replacement = r"\1" + SEPARATOR + r"\2"
+    processed = AB_ACRONYM.sub(replacement, AB_SENIOR.sub(replacement, text))
+    sentences = []
+    for match in RE_SENTENCE.finditer(processed):
+        sentence = UNDO_AB_SENIOR.sub(r"\1 \2", match.group())
+        sentences.append(UNDO_AB_ACRONYM.sub(r"\1 \2", sentence))
+    return sentences
+
+
+def preprocess(sentence):
+    """Function to get the stemmed content words of a sentence, as gensim does"""
+    s = RE_TAGS.sub("", sentence.lower())
+    s = RE_PUNCT.sub(" ", s)
+    s = RE_WHITESPACE.sub(" ", s)
+    s = RE_NUMERIC.sub("", s)
+    words = [w for w in s.split() if w not in STOPWORDS and len(w) >= 3]
+    return [_stem(w) for w in words]
+
+
+def bag_of_words(tokens):
+    """Function to get the hashable bag of words of a sentence.
+
+    gensim ranks sentences by their sorted (token, count) pairs, so sentences
+    with the same bag of words are one node of the graph.
+    """
+    counts = {}
+    for token in tokens:
+        counts[token] = counts.get(token, 0) + 1
+    return tuple(sorted(counts.items()))
+
+
+def bm25_weights(nodes):
+    """Function to get the BM25 score of every node against every other one.
+
+    Terms are the (token, count) pairs of the bags of words, as in gensim.
+    Returns a sparse matrix whose entry (i, j) scores node i as the query
+    against node j.
+    """
+    vocab = {}
+    rows, cols = [], []
+    for row, bow in enumerate(nodes):
+        for term in bow:
+            rows.append(row)
+            cols.append(vocab.setdefault(term, len(vocab)))
+    num_nodes = len(nodes)
+    terms = sparse.csr_matrix(
+        (np.ones(len(cols)), (rows, cols)), shape=(num_nodes, len(vocab))
+    )
+
+    doc_freq = np.asarray(terms.sum(axis=0)).ravel()
+    idf = np.log(num_nodes - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+    if len(idf):
+        idf[idf < 0] = EPSILON * idf.mean()
+
+    doc_len = np.array([len(bow) for bow in nodes], dtype=np.float64)
+    avgdl = doc_len.mean()
+    # Every term appears once per node, so BM25 reduces to a weighted overlap
+    doc_factor = (PARAM_K1 + 1) / (
+        1 + PARAM_K1 * (1 - PARAM_B + PARAM_B * doc_len / avgdl)
+    )
+    return (terms @ sparse.diags(idf) @ terms.T) @ sparse.diags(doc_factor)
+
+
+def similarity_graph(weights, threshold=WEIGHT_THRESHOLD):
+    """Function to get the symmetric graph gensim builds from the BM25 scores.
+
+    gensim adds each undirected edge once, with the weight of the first
+    direction above threshold, which is (i, j) for i < j unless that one is
+    below threshold.
+    """
+    weights = sparse.csr_matrix(weights)
+    weights.setdiag(0)
+    weights.data[weights.data < threshold] = 0
+    weights.eliminate_zeros()
+
+    upper = sparse.triu(weights, k=1).tocsr()
+    lower = sparse.tril(weights, k=-1).T.tocsr()
+    lower = lower - lower.multiply(upper.astype(bool))
+    lower.eliminate_zeros()
+    edges = upper + lower
+    return (edges + edges.T).tocsr()
+
+
+def pagerank(graph, damping=DAMPING):
+    """Function to get the weighted PageRank of every node of the graph.
+
+    Power iteration on the sparse transition matrix, with the teleport term
+    added as a scalar instead of a dense matrix. Converges to the principal
+    eigenvector gensim gets from the dense Google matrix.
+    """
+    num_nodes = graph.shape[0]
+    out_weights = np.asarray(graph.sum(axis=1)).ravel()
+    transition_t = (sparse.diags(1.0 / out_weights) @ graph).T.tocsr()
+    scores = np.full(num_nodes, 1.0 / num_nodes)
+    for _ in range(PAGERANK_MAX_ITER):
+        next_scores = damping * (transition_t @ scores) + (1 - damping) / num_nodes
+        next_scores /= next_scores.sum()
+        change = np.abs(next_scores - scores).sum()
+        scores = next_scores
+        if change < PAGERANK_TOLERANCE:
+            break
+    return scores
+
+
+def rank_sentences(bows):
+    """Function to get the TextRank score of each sentence's bag of words.
+
+    Returns a dict of bag of words -> score. Sentences left out of the graph
+    are missing from it, and the dict is empty when fewer than three nodes
+    are connected.
+    """
+    nodes = list(dict.fromkeys(bows))
+    graph = similarity_graph(bm25_weights(nodes))
+    if graph.nnz == 0:
+        # No similar sentences, gensim links every pair with weight 1
+        graph = sparse.csr_matrix(np.ones((len(nodes), len(nodes))))
+        graph.setdiag(0)
+        graph.eliminate_zeros()
+
+    # Drop the sentences not linked to any other one
+    reachable = np.flatnonzero(graph.getnnz(axis=1))
+    if len(reachable) < 3:
+        return {}
+    graph = graph[reachable][:, reachable]
+    scores = pagerank(graph)
+    return {nodes[i]: score for i, score in zip(reachable, scores)}
+
+
+def _select_by_word_count(sentences, word_count):
+    """Function to take sentences while they bring the length closer to word_count"""
+    length = 0
+    selected = []
+    for index, sentence in sentences:
+        words_in_sentence = len(sentence.split())
+        if abs(word_count - length - words_in_sentence) > abs(word_count - length):
+            break
+        selected.append((index, sentence))
+        length += words_in_sentence
+    return selected
+
+
+def summarize(text, ratio=0.2, word_count=None, split=False):
+    """Function to summarize a text with TextRank.
+
+    Same contract and output as gensim.summarization.summarize from gensim
+    < 4: keeps the ratio best sentences, or as many as get closest to
+    word_count when it is given, in their original order.
+    """
+    sentences = []
+    bows = []
+    for index, sentence in enumerate(split_sentences(text)):
+        tokens = preprocess(sentence)
+        if tokens:
+            sentences.append((index, sentence))
+            bows.append(bag_of_words(tokens))
+
+    if not sentences:
+        return [] if split else ""
+    if len(sentences) == 1:
+        raise ValueError("input must have more than one sentence")
+
+    scores = rank_sentences(bows)
+    if not scores:
+        return [] if split else ""
+
+    # A stable sort keeps tied sentences in document order
+    ranked = sorted(bows, key=lambda bow: scores.get(bow, 0), reverse=True)
+    num = int(len(bows) * (ratio if word_count is None else 1))
+    # Sentences with the same bag of words map to the last one, as in gensim
+    sentence_by_bow = dict(zip(bows, sentences))
+    selected = [sentence_by_bow[bow] for bow in ranked[:num]]
+    if word_count is not None:
+        selected = _select_by_word_count(selected, word_count)
+
+    selected.sort(key=lambda item: item[0])
+    texts = [sentence for _, sentence in selected]
+    return texts if split else "\n".join(texts)
@@ -1,3 +1,5 @@
+import os
+
 import streamlit as st
 import streamlit.components.v1 as stc
 
@@ -11,7 +13,7 @@ from app_utils import *
 
 def main():
     st.title("NLP App with Streamlit")
-    menu = ["Home", "NLP(files)", "About"]
+    menu = ["Home", "NLP(files)", "NLP(batch)", "About"]
 
     choice = st.sidebar.selectbox("Menu", menu)
 
@@ -20,29 +22,36 @@ def main():
         raw_text = st.text_area("Enter Text Here")
         num_of_most_common = st.sidebar.number_input("Most Common Tokens", 5, 15)
         if st.button("Analyze"):
-            with st.beta_expander("Original Text"):
+            with st.expander("Original Text"):
                 st.write(raw_text)
 
-            with st.beta_expander("Text Analysis"):
-                token_result_df = text_analyzer(raw_text)
+            with st.expander("Text Analysis"):
+                if len(raw_text) > STREAM_MIN_CHARS:
+                    token_result_df = analyze_text_progressively(raw_text)
+                else:
+                    token_result_df = text_analyzer(raw_text)
                 st.dataframe(token_result_df)
 
-            with st.beta_expander("Entities"):
+            with st.expander("Entities"):
                 # entity_result = get_entities(raw_text)
                 # st.write(entity_result)
 
-                entity_result = render_entities(raw_text)
-                stc.html(entity_result, height=1000, scrolling=True)
+                if len(raw_text) > STREAM_MIN_CHARS:
+                    # Too long to render as one Doc, listed chunk by chunk
+                    st.dataframe(stream_entity_table(raw_text))
+                else:
+                    entity_result = render_entities(raw_text)
+                    stc.html(entity_result, height=1000, scrolling=True)
 
             # Layout
-            col1, col2 = st.beta_columns(2)
+            col1, col2 = st.columns(2)
             with col1:
-                with st.beta_expander("Word Stats"):
+                with st.expander("Word Stats"):
                     st.info("Word Statistics")
                     docx = nt.TextFrame(raw_text)
                     st.write(docx.word_stats())
 
-                with st.beta_expander("Top Keywords"):
+                with st.expander("Top Keywords"):
                     st.info("Top Keywords/Tokens")
                     processed_text = nfx.remove_stopwords(raw_text)
                     keywords = get_most_common_tokens(
@@ -50,18 +59,18 @@ def main():
                     )
                     st.write(keywords)
 
-                with st.beta_expander("Sentiment"):
+                with st.expander("Sentiment"):
                     sent_result = get_sentiment(my_text=raw_text)
                     st.write(sent_result)
 
             with col2:
-                with st.beta_expander("Plot Word Freq"):
+                with st.expander("Plot Word Freq"):
                     fig = plt.figure()
                     sns.countplot(token_result_df["Token"])
                     plt.xticks(rotation=45)
                     st.pyplot(fig)
 
-                with st.beta_expander("Plot Part of Speech"):
+                with st.expander("Plot Part of Speech"):
                     try:
                         fig = plt.figure()
                         # sns.countplot(token_result_df['Pos'])
@@ -74,55 +83,53 @@ def main():
                     except:
                         st.warning("Insufficient Data: Must be more than 2")
 
-                with st.beta_expander("Plot Wordcloud"):
+                with st.expander("Plot Wordcloud"):
                     try:
                         plot_wordcloud(my_text=raw_text)
                     except:
                         st.warning("Insufficient Data: Must be more than 2")
 
-            with st.beta_expander("Download Text Analysis Results"):
-                make_downloadable(token_result_df)
+            with st.expander("Download Text Analysis Results"):
+                make_downloadable(token_result_df, "nlp_result")
 
     elif choice == "NLP(files)":
         st.subheader("NLP Task")
         num_of_most_common = st.sidebar.number_input("Most Common Tokens", 5, 15)
         text_file = st.file_uploader("Upload Files", type=["pdf", "docx", "txt"])
         if text_file is not None:
-            if text_file.type == "application/pdf":
-                raw_text = read_pdf(text_file)
-                # st.write(raw_text)
-            elif text_file.type == "text/plain":
-                # st.write(text_file.read()) # read as bytes
-                raw_text = str(text_file.read(), encoding="utf-8")
-                # st.write(raw_text)
-            else:
-                raw_text = docx2txt.process(text_file)
-                # st.write(raw_text)
+            raw_text = read_text_file(text_file)
 
             if st.button("Analyze"):
-                with st.beta_expander("Original Text"):
+                with st.expander("Original Text"):
                     st.write(raw_text)
 
-                with st.beta_expander("Text Analysis"):
-                    token_result_df = text_analyzer(raw_text)
+                with st.expander("Text Analysis"):
+                    if len(raw_text) > STREAM_MIN_CHARS:
+                        token_result_df = analyze_text_progressively(raw_text)
+                    else:
+                        token_result_df = text_analyzer(raw_text)
                     st.dataframe(token_result_df)
 
-                with st.beta_expander("Entities"):
+                with st.expander("Entities"):
                     # entity_result = get_entities(raw_text)
                     # st.write(entity_result)
 
-                    entity_result = render_entities(raw_text)
-                    stc.html(entity_result, height=1000, scrolling=True)
+                    if len(raw_text) > STREAM_MIN_CHARS:
+                        # Too long to render as one Doc, listed chunk by chunk
+                        st.dataframe(stream_entity_table(raw_text))
+                    else:
+                        entity_result = render_entities(raw_text)
+                        stc.html(entity_result, height=1000, scrolling=True)
 
                 # Layout
-                col1, col2 = st.beta_columns(2)
+                col1, col2 = st.columns(2)
                 with col1:
-                    with st.beta_expander("Word Stats"):
+                    with st.expander("Word Stats"):
                         st.info("Word Statistics")
                         docx = nt.TextFrame(raw_text)
                         st.write(docx.word_stats())
 
-                    with st.beta_expander("Top Keywords"):
+                    with st.expander("Top Keywords"):
                         st.info("Top Keywords/Tokens")
                         processed_text = nfx.remove_stopwords(raw_text)
                         keywords = get_most_common_tokens(
@@ -130,18 +137,18 @@ def main():
                         )
                         st.write(keywords)
 
-                    with st.beta_expander("Sentiment"):
+                    with st.expander("Sentiment"):
                         sent_result = get_sentiment(my_text=raw_text)
                         st.write(sent_result)
 
                 with col2:
-                    with st.beta_expander("Plot Word Freq"):
+                    with st.expander("Plot Word Freq"):
                         fig = plt.figure()
                         sns.countplot(token_result_df["Token"])
                         plt.xticks(rotation=45)
                         st.pyplot(fig)
 
-                    with st.beta_expander("Plot Part of Speech"):
+                    with st.expander("Plot Part of Speech"):
                         try:
                             fig = plt.figure()
                             # sns.countplot(token_result_df['Pos'])
@@ -154,14 +161,52 @@ def main():
                         except:
                             st.warning("Insufficient Data")
 
-                    with st.beta_expander("Plot Wordcloud"):
+                    with st.expander("Plot Wordcloud"):
                         try:
                             plot_wordcloud(my_text=raw_text)
                         except:
                             st.warning("Insufficient Data: Must be more than 2")
 
-                with st.beta_expander("Download Text Analysis Results"):
-                    make_downloadable(token_result_df)
+                with st.expander("Download Text Analysis Results"):
+                    make_downloadable(token_result_df, "nlp_result")
+
+    elif choice == "NLP(batch)":
+        st.subheader("NLP Batch Task")
+        batch_size = st.sidebar.number_input("Batch Size", 1, 256, 16)
+        n_process = st.sidebar.number_input("Worker Processes", 1, os.cpu_count(), 1)
+        profile = st.sidebar.selectbox("Analysis Profile", list(PROFILES), index=3)
+        text_files = st.file_uploader(
+            "Upload Files", type=["pdf", "docx", "txt"], accept_multiple_files=True
+        )
+        if text_files and st.button("Analyze"):
+            named_texts = [
+                (text_file.name, read_text_file(text_file)) for text_file in text_files
+            ]
+            token_tables, entity_tables = [], []
+            progress = st.progress(0)
+            results = batch_text_analyzer(
+                named_texts, batch_size=batch_size, n_process=n_process, profile=profile
+            )
+            for i, (name, token_df, entity_df) in enumerate(results, start=1):
+                with st.expander(name):
+                    st.info("Tokens")
+                    st.dataframe(token_df)
+                    st.info("Entities")
+                    st.dataframe(entity_df)
+                token_tables.append((name, token_df))
+                entity_tables.append((name, entity_df))
+                progress.progress(i / len(named_texts))
+
+            with st.expander("Combined Tokens"):
+                combined_token_df = combine_tables(token_tables)
+                st.dataframe(combined_token_df)
+
+            with st.expander("Combined Entities"):
+                combined_entity_df = combine_tables(entity_tables)
+                st.dataframe(combined_entity_df)
+
+            with st.expander("Download Text Analysis Results"):
+                make_downloadable(combined_token_df, "nlp_batch_result")
 
     else:
         st.subheader("About")
@@ -1,73 +1,258 @@
 # core packages
 import streamlit as st
 
-# Load NLP Packages
-import spacy
-
-from spacy import displacy
-from textblob import TextBlob
-
+import numpy as np
 import pandas as pd
-from collections import Counter
 
 # Data Visualization Packages
-import seaborn as sns
-import matplotlib.pyplot as plt
 import matplotlib
 
-# File Processing Packages
-import docx2txt
-import pdfplumber
-import base64
-
 # utils
-import time
+import io
+import re
+import string
 
-timestr = time.strftime("%Y%m%d-%H%M%S")
+from cache_utils import get_text_hash
+from download_utils import make_downloadable
+from filecache_utils import get_extraction_cache
+from freq_utils import get_word_freq
+from import_utils import lazy_import
+from model_utils import PROFILES, get_doc_cache, get_nlp
 
 matplotlib.use("Agg")
 
-# Function to get Wordcloud
-from wordcloud import WordCloud
-
-nlp = spacy.load("en_core_web_sm")
+# Heavy packages are only imported when a page first uses them
+spacy = lazy_import("spacy")
+textblob = lazy_import("textblob")
+sns = lazy_import("seaborn")
+plt = lazy_import("matplotlib.pyplot")
+wordcloud = lazy_import("wordcloud")
+docx2txt = lazy_import("docx2txt")
+pdf_utils = lazy_import("pdf_utils")
 
 
 # Functions
-def text_analyzer(my_text):
-    docx = nlp(my_text)
-    all_data = [
-        (
-            token.text,
-            token.shape_,
-            token.pos_,
-            token.tag_,
-            token.lemma_,
-            token.is_alpha,
-            token.is_stop,
-        )
-        for token in docx
+def get_doc(my_text, profile="full"):
+    """Function to get the parsed Doc of a text, reparsing only edited paragraphs.
+
+    Paragraph Docs are cached by the hash of their text, so after an edit
+    only new or changed paragraphs go through the pipeline. The paragraph
+    Docs are then joined back into one Doc.
+    """
+    doc_cache = get_doc_cache(profile)
+    paragraphs = split_paragraphs(my_text)
+    if len(paragraphs) <= 1 or my_text in doc_cache:
+        return doc_cache.get(my_text)
+
+    missing = [
+        paragraph
+        for paragraph in dict.fromkeys(paragraphs)
+        if paragraph not in doc_cache
     ]
-    df = pd.DataFrame(
-        all_data,
-        columns=["Token", "Shape", "Pos", "Tag", "Lemma", "IsAlpha", "Is_Stopword"],
-    )
+    for paragraph, docx in zip(missing, get_nlp(profile).pipe(missing)):
+        doc_cache.put(get_text_hash(paragraph), docx)
+    docs = [doc_cache.get(paragraph) for paragraph in paragraphs]
+    return spacy.tokens.Doc.from_docs(docs, ensure_whitespace=False)
+
+
+def text_analyzer(my_text, profile="pos"):
+    docx = get_doc(my_text, profile)
+    return get_token_table(docx)
+
+
+TOKEN_TABLE_COLUMNS = [
+    "Token",
+    "Shape",
+    "Pos",
+    "Tag",
+    "Lemma",
+    "IsAlpha",
+    "Is_Stopword",
+]
+
+
+def _categorical_from_ids(ids, strings):
+    """Function to turn spaCy hash IDs into a categorical of their strings"""
+    unique_ids, codes = np.unique(ids, return_inverse=True)
+    categories = [strings[int(string_id)] for string_id in unique_ids]
+    return pd.Categorical.from_codes(codes.reshape(-1), categories=categories)
+
+
+def get_token_table(docx):
+    """Function to build the token table from the Doc's attribute arrays.
+
+    String columns are categoricals built from spaCy's hash IDs, so each
+    distinct string is resolved once. Flag columns are numpy bools.
+    """
+    attrs = spacy.attrs
+    ids = docx.to_array(
+        [
+            attrs.ORTH,
+            attrs.SHAPE,
+            attrs.POS,
+            attrs.TAG,
+            attrs.LEMMA,
+            attrs.IS_ALPHA,
+            attrs.IS_STOP,
+        ]
+    ).reshape(len(docx), 7)
+    strings = docx.vocab.strings
+    columns = {
+        name: _categorical_from_ids(ids[:, i], strings)
+        for i, name in enumerate(TOKEN_TABLE_COLUMNS[:5])
+    }
+    columns["IsAlpha"] = ids[:, 5].astype(bool)
+    columns["Is_Stopword"] = ids[:, 6].astype(bool)
+    return pd.DataFrame(columns)
+
+
+# Texts longer than STREAM_MIN_CHARS are analyzed in chunks of CHUNK_CHARS
+STREAM_MIN_CHARS = 200_000
+CHUNK_CHARS = 50_000
+
+PARAGRAPH_END = re.compile(r"(?<=\n\n)")
+SENTENCE_END = re.compile(r"(?<=[.!?])(?=\s)")
+
+
+def split_paragraphs(my_text):
+    """Function to split a text into paragraphs that join back to the text"""
+    return [paragraph for paragraph in PARAGRAPH_END.split(my_text) if paragraph]
+
+
+def _split_text_units(my_text, max_chars):
+    for paragraph in PARAGRAPH_END.split(my_text):
+        if len(paragraph) <= max_chars:
+            yield paragraph
+            continue
+        for sentence in SENTENCE_END.split(paragraph):
+            for start in range(0, len(sentence), max_chars):
+                yield sentence[start : start + max_chars]
+
+
+def split_text_chunks(my_text, max_chars=CHUNK_CHARS):
+    """Yield chunks of at most max_chars, split at paragraph or sentence ends"""
+    chunk, chunk_len = [], 0
+    for unit in _split_text_units(my_text, max_chars):
+        if chunk and chunk_len + len(unit) > max_chars:
+            yield "".join(chunk)
+            chunk, chunk_len = [], 0
+        chunk.append(unit)
+        chunk_len += len(unit)
+    if chunk:
+        yield "".join(chunk)
+
+
+def stream_text_analyzer(my_text, profile="pos", max_chars=CHUNK_CHARS):
+    """Yield (chunk_chars, token_df) for each chunk of a large text.
+
+    Only one chunk's Doc is alive at a time and the tables use categorical
+    columns, so memory does not grow with the size of a single Doc.
+    """
+    nlp = get_nlp(profile)
+    for docx in nlp.pipe(split_text_chunks(my_text, max_chars), batch_size=1):
+        yield len(docx.text), get_token_table(docx)
+
+
+def concat_tables(tables):
+    """Function to stack tables, keeping categorical columns categorical"""
+    if not tables:
+        return pd.DataFrame(columns=TOKEN_TABLE_COLUMNS)
+    columns = {}
+    for column in tables[0].columns:
+        values = [df[column] for df in tables]
+        if isinstance(values[0].dtype, pd.CategoricalDtype):
+            columns[column] = pd.api.types.union_categoricals(values)
+        else:
+            columns[column] = np.concatenate([value.to_numpy() for value in values])
+    return pd.DataFrame(columns)
+
+
+def analyze_text_progressively(my_text, profile="pos"):
+    """Function to analyze a large text chunk by chunk, showing partial results"""
+    progress = st.progress(0)
+    status = st.empty()
+    preview = st.empty()
+    tables = []
+    done_chars = num_tokens = 0
+    for chunk_chars, df in stream_text_analyzer(my_text, profile):
+        tables.append(df)
+        done_chars += chunk_chars
+        num_tokens += len(df)
+        progress.progress(min(done_chars / len(my_text), 1.0))
+        status.info("Analyzed {} tokens in {} chunks".format(num_tokens, len(tables)))
+        preview.dataframe(df)
+    preview.empty()
+    return concat_tables(tables)
+
+
+def get_entities(my_text, profile="ner"):
+    docx = get_doc(my_text, profile)
+    entities = [(entity.text, entity.label_) for entity in docx.ents]
+    return entities
+
+
+def get_entity_table(docx):
+    entities = [
+        (entity.text, entity.label_, entity.start_char, entity.end_char)
+        for entity in docx.ents
+    ]
+    df = pd.DataFrame(entities, columns=["Entity", "Label", "Start", "End"])
     return df
 
 
-def get_entities(my_text):
-    docx = nlp(my_text)
-    entities = [(entity.text, entity.label_) for entity in docx.ents]
-    return entities
+def stream_entity_table(my_text, profile="ner", max_chars=CHUNK_CHARS):
+    """Function to get the entity table of a large text, parsed chunk by chunk.
+
+    Like stream_text_analyzer, only one chunk's Doc is alive at a time.
+    Start and End are offsets into my_text.
+    """
+    nlp = get_nlp(profile)
+    tables = []
+    offset = 0
+    for docx in nlp.pipe(split_text_chunks(my_text, max_chars), batch_size=1):
+        df = get_entity_table(docx)
+        tables.append(df.assign(Start=df["Start"] + offset, End=df["End"] + offset))
+        offset += len(docx.text)
+    if not tables:
+        return get_entity_table(nlp.make_doc(""))
+    return pd.concat(tables, ignore_index=True)
+
+
+# Function to analyze many documents in one pass with nlp.pipe
+def batch_text_analyzer(named_texts, batch_size=16, n_process=1, profile="full"):
+    """Yield (name, token_df, entity_df) for each (name, text) pair.
+
+    Documents are streamed through nlp.pipe, so results are available as
+    soon as each batch is done. Parsed Docs are added to the shared cache.
+    """
+    nlp = get_nlp(profile)
+    doc_cache = get_doc_cache(profile)
+    docs = nlp.pipe(
+        ((text, name) for name, text in named_texts),
+        as_tuples=True,
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    for docx, name in docs:
+        doc_cache.put(get_text_hash(docx.text), docx)
+        yield name, get_token_table(docx), get_entity_table(docx)
+
+
+def combine_tables(named_tables):
+    """Function to stack per document tables with a Document column"""
+    frames = [df.assign(Document=name) for name, df in named_tables]
+    if not frames:
+        return pd.DataFrame()
+    return concat_tables(frames)
 
 
 HTML_WRAPPER = ""
 
 
 # @st.cache
-def render_entities(raw_text):
-    docx = nlp(raw_text)
-    html = displacy.render(docx, style="ent")
+def render_entities(raw_text, profile="ner"):
+    docx = get_doc(raw_text, profile)
+    html = spacy.displacy.render(docx, style="ent")
     html = html.replace("\n\n", "\n")
     # result = HTML_WRAPPER.format(html)
     return html
@@ -75,53 +260,56 @@ def render_entities(raw_text):
 
 # Function to get most common tokens
 def get_most_common_tokens(my_text, num=5):
-    word_tokens = Counter(my_text.split())
+    word_tokens = get_word_freq(my_text)
     most_common_tokens = dict(word_tokens.most_common(num))
     return most_common_tokens
 
 
 # Function to get Sentiment
 def get_sentiment(my_text):
-    blob = TextBlob(my_text)
+    blob = textblob.TextBlob(my_text)
     sentiment = blob.sentiment
     return sentiment
 
 
 def plot_wordcloud(my_text):
-    my_wordcloud = WordCloud().generate(my_text)
+    frequencies = get_word_freq(my_text).frequencies(
+        exclude=wordcloud.STOPWORDS, strip=string.punctuation
+    )
+    my_wordcloud = wordcloud.WordCloud().generate_from_frequencies(frequencies)
     fig = plt.figure()
     plt.imshow(my_wordcloud, interpolation="bilinear")
     plt.axis("off")
     st.pyplot(fig)
 
 
-# Function to Download Text Analysis Results
-def make_downloadable(data):
-    csvfile = data.to_csv(index=False)
-    b64 = base64.b64encode(csvfile.encode()).decode()
-    new_filename = "nlp_result_{}_.csv".format(timestr)
-    st.markdown("### ** Download CSV file **")
-    href = f'<a href="data:file/csv;base64,{b64}" download="{new_filename}">Click here !</a>'
-    st.markdown(href, unsafe_allow_html=True)
-
-
 # Function to read PDF
-from PyPDF2 import PdfFileReader
-import pdfplumber
-
-
-def read_pdf(file):
-    pdf_reader = PdfFileReader(file)
-    count = pdf_reader.numPages
-    all_page_text = ""
-    for i in range(count):
-        page = pdf_reader.getPage(i)
-        all_page_text += page.extractText()
-
-    return all_page_text
+def read_pdf(file, first_page=0, last_page=None):
+    return pdf_utils.read_pdf(file, first_page, last_page)
+
+
+# Function to extract the text of PDF, DOCX or TXT bytes
+def extract_text(data, file_type, max_pages=None):
+    if file_type == "application/pdf":
+        raw_text = read_pdf2(io.BytesIO(data), last_page=max_pages)
+    elif file_type == "text/plain":
+        raw_text = str(data, encoding="utf-8")
+    else:
+        raw_text = docx2txt.process(io.BytesIO(data))
+    return raw_text
+
+
+# Function to read the text of an uploaded PDF, DOCX or TXT file
+def read_text_file(text_file, max_pages=None):
+    """Function to get the text of an upload, extracted once per content hash"""
+    return get_extraction_cache().get_or_extract(
+        "text-{}-{}".format(text_file.type, max_pages),
+        text_file.getvalue(),
+        lambda data: extract_text(data, text_file.type, max_pages),
+    )
 
 
-def read_pdf2(file):
-    with pdfplumber.open(file) as pdf:
-        page = pdf.pages[0]
-        return page.extract_text()
+# Function to read every page of a PDF on the process pool, with PyPDF2 or
+# pdfplumber picked per page
+def read_pdf2(file, first_page=0, last_page=None):
+    return pdf_utils.read_pdf_parallel(file, first_page, last_page)
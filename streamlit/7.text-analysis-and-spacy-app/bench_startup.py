@@ -0,0 +1,82 @@
+"""Startup benchmark for the NLP app.
+
+Runs ``python -X importtime`` on a module in a fresh interpreter and reports
+the total import time with the slowest imports, then times the first load
+of each analysis profile. Use ``--max-import-ms`` to fail on regressions.
+
+    python bench_startup.py
+    python bench_startup.py --module app_utils --top 15 --max-import-ms 1500
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import_time(module):
+    """Function to get (total_us, [(cumulative_us, name), ...]) of an import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        imports.append((int(cumulative_us), name.strip()))
+    total_us = next(us for us, name in reversed(imports) if name == module)
+    return total_us, imports
+
+
+def measure_model_load(profiles):
+    """Function to get the first load time of each profile in seconds"""
+    from model_utils import get_nlp
+
+    timings = {}
+    for profile in profiles:
+        start = time.perf_counter()
+        get_nlp(profile)
+        timings[profile] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app_utils")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--skip-models", action="store_true")
+    args = parser.parse_args()
+
+    total_us, imports = measure_import_time(args.module)
+    print("Import time of {}: {:.1f} ms".format(args.module, total_us / 1000))
+    print("Slowest imports (cumulative):")
+    for cumulative_us, name in sorted(imports, reverse=True)[: args.top]:
+        print("  {:>10.1f} ms  {}".format(cumulative_us / 1000, name))
+
+    if not args.skip_models:
+        from model_utils import PROFILES
+
+        print("First load time per analysis profile:")
+        for profile, seconds in measure_model_load(PROFILES).items():
+            print("  {:>10.1f} ms  {}".format(seconds * 1000, profile))
+
+    if args.max_import_ms is not None and total_us / 1000 > args.max_import_ms:
+        print(
+            "Import time {:.1f} ms exceeds budget of {:.1f} ms".format(
+                total_us / 1000, args.max_import_ms
+            )
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Caching Packages
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from import_utils import lazy_import
+
+spacy = lazy_import("spacy")
+
+
+def get_text_hash(my_text):
+    """Function to get a content hash of a text"""
+    return hashlib.blake2b(my_text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class DocCache:
+    """LRU cache of parsed spaCy Docs keyed by the hash of their text.
+
+    The cache is bounded by the total number of tokens held in memory.
+    When ``spill_dir`` is given, evicted Docs are written there as DocBin
+    files and read back on the next request instead of being reparsed.
+    """
+
+    def __init__(self, nlp, max_tokens=500_000, spill_dir=None):
+        self.nlp = nlp
+        self.max_tokens = max_tokens
+        self.spill_dir = spill_dir
+        self._docs = OrderedDict()
+        self._num_tokens = 0
+        self._lock = threading.Lock()
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, my_text):
+        return get_text_hash(my_text) in self._docs
+
+    def get(self, my_text):
+        """Return the Doc for my_text, parsing it only on a cache miss"""
+        key = get_text_hash(my_text)
+        with self._lock:
+            docx = self._docs.get(key)
+            if docx is not None:
+                self._docs.move_to_end(key)
+                return docx
+
+        docx = self._load_spilled(key)
+        if docx is None:
+            docx = self.nlp(my_text)
+        self.put(key, docx)
+        return docx
+
+    def put(self, key, docx):
+        with self._lock:
+            if key in self._docs:
+                self._docs.move_to_end(key)
+                return
+            self._docs[key] = docx
+            self._num_tokens += len(docx)
+            # Always keep the newest Doc, even if it alone exceeds the bound
+            while self._num_tokens > self.max_tokens and len(self._docs) > 1:
+                old_key, old_docx = self._docs.popitem(last=False)
+                self._num_tokens -= len(old_docx)
+                self._spill(old_key, old_docx)
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+            self._num_tokens = 0
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, "{}.spacy".format(key))
+
+    def _spill(self, key, docx):
+        if self.spill_dir is None:
+            return
+        path = self._spill_path(key)
+        if not os.path.exists(path):
+            spacy.tokens.DocBin(docs=[docx], store_user_data=True).to_disk(path)
+
+    def _load_spilled(self, key):
+        if self.spill_dir is None:
+            return None
+        path = self._spill_path(key)
+        if not os.path.exists(path):
+            return None
+        doc_bin = spacy.tokens.DocBin().from_disk(path)
+        return next(doc_bin.get_docs(self.nlp.vocab), None)
@@ -0,0 +1,74 @@
+# Download Packages
+import tempfile
+import time
+
+import streamlit as st
+
+# Format -> (file extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "JSONL": ("jsonl", "application/jsonl"),
+}
+
+# Rows written to the file per chunk / Parquet row group
+CHUNK_ROWS = 50_000
+
+
+def _to_parquet_safe(data):
+    """Function to turn mixed-type object columns into strings for Parquet"""
+    object_columns = data.select_dtypes(include="object").columns
+    return data.astype({column: str for column in object_columns})
+
+
+def write_table(data, file_format="CSV", chunk_rows=CHUNK_ROWS):
+    """Write a DataFrame to a temporary file in chunks of rows.
+
+    Returns the file rewound to the start. The file is unbuffered (a raw
+    io.FileIO), is already unlinked, and is removed once it is closed.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(
+            "Unknown export format {!r}, expected one of {}".format(
+                file_format, list(EXPORT_FORMATS)
+            )
+        )
+    file = tempfile.TemporaryFile(buffering=0)
+    if file_format == "Parquet":
+        _to_parquet_safe(data).to_parquet(file, index=False, row_group_size=chunk_rows)
+    else:
+        for start in range(0, max(len(data), 1), chunk_rows):
+            chunk = data.iloc[start : start + chunk_rows]
+            if file_format == "CSV":
+                text = chunk.to_csv(index=False, header=start == 0)
+            else:
+                text = chunk.to_json(orient="records", lines=True, default_handler=str)
+                if text and not text.endswith("\n"):
+                    text += "\n"
+            file.write(text.encode("utf-8"))
+    file.seek(0)
+    return file
+
+
+# Function to Download Results
+@st.fragment
+def make_downloadable(data, prefix="result"):
+    """Show a download button that only writes the file when it is clicked.
+
+    Picking a format reruns this fragment alone and the download does not
+    rerun the app, so results shown under an st.button stay on the page.
+    """
+    st.markdown("### ** Download File **")
+    file_format = st.radio(
+        "Format", list(EXPORT_FORMATS), horizontal=True, key=prefix + "_format"
+    )
+    extension, mime = EXPORT_FORMATS[file_format]
+    timestr = time.strftime("%Y%m%d-%H%M%S")
+    st.download_button(
+        "Click here !",
+        data=lambda: write_table(data, file_format),
+        file_name="{}_{}.{}".format(prefix, timestr, extension),
+        mime=mime,
+        key=prefix + "_download",
+        on_click="ignore",
+    )
@@ -0,0 +1,35 @@
+# Lazy Loading Packages
+import importlib
+import threading
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+
+    The imported module stays resident in sys.modules, so only the first
+    use pays the import cost and later script reruns get it for free.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return "<LazyModule {!r} ({})>".format(self._name, state)
+
+
+def lazy_import(name):
+    """Function to get a module that is only imported when first used"""
+    return LazyModule(name)
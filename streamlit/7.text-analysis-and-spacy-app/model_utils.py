@@ -0,0 +1,72 @@
+# Load NLP Packages
+import os
+import threading
+
+from cache_utils import DocCache
+from import_utils import lazy_import
+
+spacy = lazy_import("spacy")
+
+MODEL_NAME = "en_core_web_sm"
+
+# Every component shipped with the model, in pipeline order
+MODEL_COMPONENTS = [
+    "tok2vec",
+    "tagger",
+    "parser",
+    "senter",
+    "attribute_ruler",
+    "lemmatizer",
+    "ner",
+]
+
+# Components each analysis profile needs, None keeps the whole pipeline
+PROFILES = {
+    "tokens": [],
+    "pos": ["tok2vec", "tagger", "attribute_ruler", "lemmatizer"],
+    "ner": ["ner"],
+    "full": None,
+}
+
+# Set NLP_DOC_CACHE_DIR to spill evicted Docs to disk
+DOC_CACHE_DIR = os.environ.get("NLP_DOC_CACHE_DIR")
+
+# Process-wide registry of loaded models and their Doc caches
+_models = {}
+_doc_caches = {}
+_registry_lock = threading.Lock()
+
+
+def load_profile(profile):
+    """Function to load the model with only the components a profile needs"""
+    if profile not in PROFILES:
+        raise ValueError(
+            "Unknown analysis profile {!r}, expected one of {}".format(
+                profile, list(PROFILES)
+            )
+        )
+    needed = PROFILES[profile]
+    if needed is None:
+        return spacy.load(MODEL_NAME)
+    excluded = [name for name in MODEL_COMPONENTS if name not in needed]
+    return spacy.load(MODEL_NAME, exclude=excluded)
+
+
+def get_nlp(profile="full"):
+    """Function to get the resident model of a profile, loading it once"""
+    with _registry_lock:
+        if profile not in _models:
+            _models[profile] = load_profile(profile)
+        return _models[profile]
+
+
+def get_doc_cache(profile="full"):
+    """Function to get the Doc cache of a profile"""
+    nlp = get_nlp(profile)
+    with _registry_lock:
+        if profile not in _doc_caches:
+            spill_dir = None
+            if DOC_CACHE_DIR is not None:
+                spill_dir = os.path.join(DOC_CACHE_DIR, profile)
+            _doc_caches[profile] = DocCache(nlp, spill_dir=spill_dir)
+        return _doc_caches[profile]
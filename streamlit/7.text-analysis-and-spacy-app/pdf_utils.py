@@ -0,0 +1,212 @@
+# PDF Packages
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
+
+from PyPDF2 import PdfFileReader
+
+# Worker processes for parallel extraction, set PDF_WORKERS to change
+MAX_WORKERS = int(os.environ.get("PDF_WORKERS", os.cpu_count() or 1))
+
+# Pages extracted per pool task, and the fewest pages worth a pool at all
+PAGES_PER_TASK = 8
+PARALLEL_MIN_PAGES = 16
+
+# Font subtypes whose text PyPDF2 often gets wrong, read with pdfplumber
+PLUMBER_FONT_SUBTYPES = ("/Type0", "/Type3")
+
+# Levels of nested form XObjects searched for fonts by the probe
+PROBE_MAX_DEPTH = 3
+
+
+@contextmanager
+def open_pdf(source):
+    """Function to open a PdfFileReader on a path or a binary file object.
+
+    The reader only parses the cross-reference table and the trailer, page
+    objects are resolved when a page is asked for. A path is closed on exit.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield PdfFileReader(f, strict=False)
+    else:
+        source.seek(0)
+        yield PdfFileReader(source, strict=False)
+
+
+def get_pdf_info(source):
+    """Function to get the document info of a PDF as a dict.
+
+    Only the trailer's Info dictionary is read, no page is loaded.
+    """
+    with open_pdf(source) as pdf_reader:
+        pdf_info = pdf_reader.getDocumentInfo()
+    return {key: str(value) for key, value in (pdf_info or {}).items()}
+
+
+def _page_range(num_pages, first_page=0, last_page=None):
+    """Function to clip a 0-based [first_page, last_page) range to the PDF"""
+    if last_page is None or last_page > num_pages:
+        last_page = num_pages
+    return range(max(first_page, 0), last_page)
+
+
+def iter_pdf_pages(source, first_page=0, last_page=None):
+    """Function to yield the text of each page in [first_page, last_page).
+
+    Pages are parsed one at a time as the generator is consumed, so a
+    caller that stops early never touches the rest of the document.
+    """
+    with open_pdf(source) as pdf_reader:
+        for i in _page_range(pdf_reader.getNumPages(), first_page, last_page):
+            yield pdf_reader.getPage(i).extractText()
+
+
+# Function to read PDF
+def read_pdf(source, first_page=0, last_page=None):
+    """Function to get the text of the pages in [first_page, last_page)"""
+    buffer = io.StringIO()
+    for page_text in iter_pdf_pages(source, first_page, last_page):
+        buffer.write(page_text)
+    return buffer.getvalue()
+
+
+def _iter_fonts(resources, depth=0):
+    """Yield the font dictionaries of a resource dict and its form XObjects"""
+    resources = resources.getObject() if resources is not None else {}
+    fonts = resources.get("/Font")
+    if fonts is not None:
+        for font in fonts.getObject().values():
+            yield font.getObject()
+    xobjects = resources.get("/XObject")
+    if xobjects is None or depth >= PROBE_MAX_DEPTH:
+        return
+    for xobject in xobjects.getObject().values():
+        xobject = xobject.getObject()
+        if xobject.get("/Subtype") == "/Form":
+            yield from _iter_fonts(xobject.get("/Resources"), depth + 1)
+
+
+def probe_page(page):
+    """Function to pick the text backend of a page from its font resources.
+
+    Returns None for a page without fonts (a scanned image, nothing to
+    extract), "pdfplumber" when a composite or Type3 font is used and
+    "pypdf2" otherwise. The content stream is never decoded.
+    """
+    subtypes = {font.get("/Subtype") for font in _iter_fonts(page.get("/Resources"))}
+    if not subtypes:
+        return None
+    if subtypes.intersection(PLUMBER_FONT_SUBTYPES):
+        return "pdfplumber"
+    return "pypdf2"
+
+
+def extract_pages(path, first_page, last_page):
+    """Function run in a worker: get the text of pages [first_page, last_page).
+
+    The worker opens the file itself, and pdfplumber only when the probe
+    asks for it on one of the pages.
+    """
+    texts = []
+    plumber_pdf = None
+    try:
+        with open_pdf(path) as pdf_reader:
+            for i in range(first_page, last_page):
+                page = pdf_reader.getPage(i)
+                backend = probe_page(page)
+                if backend is None:
+                    texts.append("")
+                elif backend == "pypdf2":
+                    texts.append(page.extractText())
+                else:
+                    if plumber_pdf is None:
+                        import pdfplumber
+
+                        plumber_pdf = pdfplumber.open(path)
+                    texts.append(plumber_pdf.pages[i].extract_text() or "")
+    finally:
+        if plumber_pdf is not None:
+            plumber_pdf.close()
+    return texts
+
+
+@lru_cache(maxsize=1)
+def get_executor():
+    """Function to get the process pool shared by every rerun and session"""
+    return ProcessPoolExecutor(max_workers=MAX_WORKERS)
+
+
+def reset_executor(executor):
+    """Function to drop a broken pool, so get_executor starts a new one"""
+    if get_executor() is executor:
+        get_executor.cache_clear()
+    executor.shutdown(wait=False)
+
+
+def get_live_executor():
+    """Function to get the shared pool, replacing it if it broke unseen.
+
+    A worker can crash in a run that stopped before reading its results,
+    which leaves a pool whose submit raises BrokenProcessPool.
+    """
+    executor = get_executor()
+    try:
+        executor.submit(int)
+    except BrokenProcessPool:
+        reset_executor(executor)
+        executor = get_executor()
+    return executor
+
+
+@contextmanager
+def _as_path(source):
+    """Function to get a file path for source, spooling file objects to disk"""
+    if isinstance(source, str):
+        yield source
+        return
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        shutil.copyfileobj(source, f)
+    try:
+        yield f.name
+    finally:
+        os.remove(f.name)
+
+
+def read_pdf_parallel(
+    source, first_page=0, last_page=None, pages_per_task=PAGES_PER_TASK
+):
+    """Function to get the text of pages [first_page, last_page) with a process pool.
+
+    The range is split into tasks of pages_per_task pages, each worker
+    opens the file on its own and picks the backend of every page with
+    probe_page. Text is joined back in page order. Short ranges are read
+    in this process, where the pool would cost more than it saves.
+    """
+    with _as_path(source) as path:
+        with open_pdf(path) as pdf_reader:
+            pages = _page_range(pdf_reader.getNumPages(), first_page, last_page)
+        if len(pages) < PARALLEL_MIN_PAGES or MAX_WORKERS <= 1:
+            return "".join(extract_pages(path, pages.start, pages.stop))
+        executor = get_live_executor()
+        futures = [
+            executor.submit(
+                extract_pages, path, start, min(start + pages_per_task, pages.stop)
+            )
+            for start in range(pages.start, pages.stop, pages_per_task)
+        ]
+        buffer = io.StringIO()
+        try:
+            for future in futures:
+                buffer.writelines(future.result())
+        except BrokenProcessPool:
+            # The next read gets a new pool instead of this broken one
+            reset_executor(executor)
+            raise
+        return buffer.getvalue()
@@ -1,3 +1,8 @@
+import html
+import math
+import string
+from itertools import groupby
+
 import streamlit as st
 import streamlit.components.v1 as stc
 
@@ -5,11 +10,12 @@ import streamlit.components.v1 as stc
 import pandas as pd
 
 # NLP Packages
-import neattext.functions as nfx
-from wordcloud import WordCloud
-from collections import Counter
+from wordcloud import STOPWORDS, WordCloud
 from textblob import TextBlob
 
+# Incremental Analysis
+from incremental_utils import analyze_text
+
 # Data Visualization Packages
 import matplotlib.pyplot as plt
 import matplotlib
@@ -18,16 +24,16 @@ import altair as alt
 matplotlib.use("Agg")
 
 
-def plot_wordcloud(docx):
-    mywordcloud = WordCloud().generate(docx)
+def plot_wordcloud(word_freq):
+    frequencies = word_freq.frequencies(exclude=STOPWORDS, strip=string.punctuation)
+    mywordcloud = WordCloud().generate_from_frequencies(frequencies)
     fig = plt.figure(figsize=(20, 10))
     plt.imshow(mywordcloud, interpolation="bilinear")
     plt.axis("off")
     st.pyplot(fig)
 
 
-def plot_word_freq(docx, num=10):
-    word_freq = Counter(docx.split())
+def plot_word_freq(word_freq, num=10):
     most_common_tokens = word_freq.most_common(num)
     x, y = zip(*most_common_tokens)
     fig = plt.figure(figsize=(20, 10))
@@ -36,8 +42,7 @@ def plot_word_freq(docx, num=10):
     st.pyplot(fig)
 
 
-def plot_word_freq_with_altair(docx, num=10):
-    word_freq = Counter(docx.split())
+def plot_word_freq_with_altair(word_freq, num=10):
     most_common_tokens = dict(word_freq.most_common(num))
     word_freq_df = pd.DataFrame(
         {
@@ -60,10 +65,8 @@ def plot_word_freq_with_altair(docx, num=10):
     st.altair_chart(c, use_container_width=True)
 
 
-def plot_mendelhall_curve(docx):
-    word_length = [len(token) for token in docx.split()]
-    word_length_count = Counter(word_length)
-    sorted_word_length_count = sorted(dict(word_length_count).items())
+def plot_mendelhall_curve(word_freq):
+    sorted_word_length_count = word_freq.length_histogram()
     x, y = zip(*sorted_word_length_count)
     mendelhall_df = pd.DataFrame({"tokens": x, "counts": y})
     st.line_chart(mendelhall_df["counts"])
@@ -116,19 +119,43 @@ TAGS = {
 }
 
 
+# Opening span of each tag, built once
+TAG_SPANS = {
+    tag: '<span style="color:{}">'.format(color) for tag, color in TAGS.items()
+}
+
+# Tagged tokens rendered per page of the PoS view
+TOKENS_PER_PAGE = 2000
+
+
+def _get_tag_span(tagged_token):
+    return TAG_SPANS.get(tagged_token[1])
+
+
 def mytag_visualizer(tagged_docx):
+    """Function to colour tokens by PoS tag, one span per run of the same tag colour.
+
+    Tokens with a tag missing from TAGS are kept as plain text.
+    """
     colored_text = []
-    for i in tagged_docx:
-        if i[1] in TAGS.keys():
-            token = i[0]
-            color_for_tag = TAGS.get(i[1])
-            result = '<span style="color:{}">{}</span>'.format(color_for_tag, token)
-            colored_text.append(result)
+    for span, run in groupby(tagged_docx, key=_get_tag_span):
+        text = " ".join(html.escape(token) for token, _ in run)
+        colored_text.append(text if span is None else span + text + "</span>")
 
     result = " ".join(colored_text)
     return result
 
 
+def get_page(items, page, per_page=TOKENS_PER_PAGE):
+    """Function to get the items of a 1-based page"""
+    start = (page - 1) * per_page
+    return items[start : start + per_page]
+
+
+def count_pages(items, per_page=TOKENS_PER_PAGE):
+    return max(math.ceil(len(items) / per_page), 1)
+
+
 def main():
     st.title("Text Analysis NLP App")
 
@@ -139,6 +166,11 @@ def main():
         # Text Area
         raw_text = st.text_area("Enter Text Here")
         if st.button("Submit"):
+            st.session_state["submitted_text"] = raw_text
+
+        # Keep the last submitted text, so paging the PoS view does not reset it
+        if "submitted_text" in st.session_state:
+            raw_text = st.session_state["submitted_text"]
             if len(raw_text) > 2:
                 st.success("Processing")
             elif len(raw_text) == 1:
@@ -149,38 +181,44 @@ def main():
             #     st.success(raw_text)
 
             # Layout
-            col1, col2 = st.beta_columns(2)
-            processed_text = nfx.remove_stopwords(raw_text)
+            col1, col2 = st.columns(2)
+            # Only new or edited paragraphs are analyzed again
+            analysis = analyze_text(raw_text)
+            processed_text = analysis["processed_text"]
 
             with col1:
-                with st.beta_expander("Original Text"):
+                with st.expander("Original Text"):
                     st.write(raw_text)
 
-                with st.beta_expander("PoS Tagged Text"):
+                with st.expander("PoS Tagged Text"):
                     # tagged_docx = get_pos_tags(raw_text)
                     # st.dataframe(tagged_docx)
 
                     # Components HTML
-                    tagged_docx = TextBlob(raw_text).tags
-                    processed_tags = mytag_visualizer(tagged_docx)
+                    tagged_docx = analysis["tags"]
+                    num_pages = count_pages(tagged_docx)
+                    page = 1
+                    if num_pages > 1:
+                        page = st.number_input("Page", 1, num_pages, key="tag_page")
+                    processed_tags = mytag_visualizer(get_page(tagged_docx, page))
                     stc.html(processed_tags, scrolling=True)
 
-                with st.beta_expander("Plot Word Freq"):
-                    # plot_word_freq(processed_text)
-                    plot_word_freq_with_altair(processed_text)
+                with st.expander("Plot Word Freq"):
+                    # plot_word_freq(analysis["word_freq"])
+                    plot_word_freq_with_altair(analysis["word_freq"])
 
             with col2:
 
-                with st.beta_expander("Processed Text"):
+                with st.expander("Processed Text"):
                     st.write(processed_text)
 
-                with st.beta_expander("Plot Wordcloud"):
+                with st.expander("Plot Wordcloud"):
                     st.success("Wordcloud")
-                    plot_wordcloud(processed_text)
+                    plot_wordcloud(analysis["word_freq"])
 
-                with st.beta_expander("Plot Stylometry Curve"):
+                with st.expander("Plot Stylometry Curve"):
                     st.success("Mendelhall Curve")
-                    plot_mendelhall_curve(raw_text)
+                    plot_mendelhall_curve(analysis["raw_word_freq"])
 
     else:
         st.subheader("About")
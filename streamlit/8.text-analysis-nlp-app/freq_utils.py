@@ -0,0 +1,58 @@
+# Word Frequency Packages
+from collections import Counter
+from functools import lru_cache
+
+
+class WordFrequencyIndex:
+    """Whitespace word counts of a text, computed once for every view.
+
+    Holds the word counts and the word length histogram. Top-k queries go
+    through Counter.most_common, which uses a heap for k < vocabulary size.
+    """
+
+    def __init__(self, docx):
+        self.counts = Counter(docx.split())
+        self.num_words = sum(self.counts.values())
+        self.length_counts = Counter()
+        for word, count in self.counts.items():
+            self.length_counts[len(word)] += count
+
+    @classmethod
+    def merge(cls, indexes):
+        """Combine the indexes of several texts, e.g. of each paragraph"""
+        merged = cls("")
+        for index in indexes:
+            merged.counts.update(index.counts)
+            merged.length_counts.update(index.length_counts)
+            merged.num_words += index.num_words
+        return merged
+
+    def most_common(self, num=10):
+        return self.counts.most_common(num)
+
+    def length_histogram(self):
+        """Return (word_length, count) pairs sorted by length"""
+        return sorted(self.length_counts.items())
+
+    def frequencies(self, exclude=None, strip=None):
+        """Return word counts, skipping words whose lowercase is in exclude.
+
+        With strip, those characters are removed from both ends of each word
+        first, so "word," and "word" are counted together.
+        """
+        if not exclude and strip is None:
+            return dict(self.counts)
+        exclude = exclude or ()
+        counts = Counter()
+        for word, count in self.counts.items():
+            if strip is not None:
+                word = word.strip(strip)
+            if word and word.lower() not in exclude:
+                counts[word] += count
+        return dict(counts)
+
+
+@lru_cache(maxsize=16)
+def get_word_freq(docx):
+    """Function to get the shared WordFrequencyIndex of a text"""
+    return WordFrequencyIndex(docx)
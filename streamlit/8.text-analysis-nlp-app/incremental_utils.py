@@ -0,0 +1,89 @@
+# Incremental Analysis Packages
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# NLP Packages
+import neattext.functions as nfx
+from textblob import TextBlob
+
+# Word Frequency
+from freq_utils import WordFrequencyIndex
+
+# Paragraphs end after a blank line, the separator stays with the paragraph
+PARAGRAPH_END = re.compile(r"(?<=\n\n)")
+
+
+def split_paragraphs(my_text):
+    """Function to split a text into paragraphs that join back to the text"""
+    return [paragraph for paragraph in PARAGRAPH_END.split(my_text) if paragraph]
+
+
+def get_paragraph_hash(paragraph):
+    return hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ParagraphCache:
+    """LRU cache of analyze(paragraph) results keyed by paragraph hash.
+
+    Re-analyzing an edited text only runs analyze on the paragraphs that
+    are new or changed since they were last seen.
+    """
+
+    def __init__(self, analyze, max_paragraphs=5000):
+        self.analyze = analyze
+        self.max_paragraphs = max_paragraphs
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, paragraph):
+        key = get_paragraph_hash(paragraph)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        result = self.analyze(paragraph)
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_paragraphs:
+                self._results.popitem(last=False)
+        return result
+
+    def analyze_text(self, my_text):
+        """Return the results of each paragraph of my_text, in order"""
+        return [self.get(paragraph) for paragraph in split_paragraphs(my_text)]
+
+
+def analyze_paragraph(paragraph):
+    processed_paragraph = nfx.remove_stopwords(paragraph)
+    return {
+        "tags": TextBlob(paragraph).tags,
+        "processed_text": processed_paragraph,
+        "word_freq": WordFrequencyIndex(processed_paragraph),
+        "raw_word_freq": WordFrequencyIndex(paragraph),
+    }
+
+
+# Lives in this module so it survives Streamlit script reruns
+paragraph_cache = ParagraphCache(analyze_paragraph)
+
+
+def analyze_text(raw_text):
+    """Function to analyze a text, reusing the results of unchanged paragraphs.
+
+    Returns the merged PoS tags, stopword-free text and word frequencies of
+    the processed and raw text.
+    """
+    results = paragraph_cache.analyze_text(raw_text)
+    return {
+        "tags": [tag for result in results for tag in result["tags"]],
+        "processed_text": " ".join(result["processed_text"] for result in results),
+        "word_freq": WordFrequencyIndex.merge(
+            result["word_freq"] for result in results
+        ),
+        "raw_word_freq": WordFrequencyIndex.merge(
+            result["raw_word_freq"] for result in results
+        ),
+    }
@@ -1,5 +1,3 @@
-import base64
-
 import streamlit as st
 import streamlit.components.v1 as stc
 
@@ -13,16 +11,12 @@ import matplotlib
 
 # Opening Files
 # For Images
-import exifread
 import os
+from image_utils import ImageInspection
 
-# For Audio
-import mutagen
-
-# For PDF
-from PyPDF2 import PdfFileReader
-
-import time
+# Extraction Cache
+from extract_utils import extract_audio_metadata, extract_pdf_metadata
+from filecache_utils import get_extraction_cache
 
 # Utils
 from app_utils import *
@@ -30,9 +24,15 @@ from app_utils import *
 # Database Management
 from db_utils import *
 
-matplotlib.use("Agg")  # TkAgg
+# Downloads
+from download_utils import make_downloadable
+
+# Bulk Extraction
+import tempfile
+import time
+from bulk_utils import bulk_extract, iter_upload_jobs, iter_zip_jobs
 
-timestr = time.strftime("%Y%m%d-%H%M%S")
+matplotlib.use("Agg")  # TkAgg
 
 # HTML
 metadata_wiki = """
@@ -46,35 +46,36 @@ HTML_BANNER = """
     """
 
 
+# Uploads shown per page of the Monitor table
+MONITOR_PAGE_SIZE = 100
+
+# Seconds between two redraws of the bulk results table
+TABLE_REFRESH_SECONDS = 0.5
+
+
 # Functions
-@st.cache
+@st.cache_resource
 def load_image(image_file):
     img = Image.open(image_file)
     return img
 
 
-# Function to Download
-def make_downloadable(data: pd.DataFrame):
-    csv_file = data.to_csv(index=False)
-    # B64 encoding
-    b64 = base64.b64encode(csv_file.encode()).decode()  # B64 encoding
-    st.markdown("### ** Download CSV File **")
-    new_filename = "metadata_result_{}.csv".format(timestr)
-    href = f"""
-    <a href="data:file/csv;base64,{b64}" download="{new_filename}">Click Here!</a>
-    """
-    st.markdown(href, unsafe_allow_html=True)
-
-
 # App Structure
 def main():
     """Meta Data Extraction App"""
     st.title("MetaData Extraction App")
     stc.html(HTML_BANNER)
 
-    menu = ["Home", "Image", "Audio", "DocumentFiles", "Analytics", "About"]
+    menu = [
+        "Home",
+        "Image",
+        "Audio",
+        "DocumentFiles",
+        "Bulk",
+        "Analytics",
+        "About",
+    ]
     choice = st.sidebar.selectbox(label="Menu", options=menu)
-    create_uploaded_file_table()
 
     if choice == "Home":
         st.subheader("Home")
@@ -84,19 +85,19 @@ def main():
         st.write(metadata_wiki)
 
         # Expanders & Columns
-        col1, col2, col3 = st.beta_columns(3)
+        col1, col2, col3 = st.columns(3)
         with col1:
-            with st.beta_expander("Get Image Metadata 📷"):
+            with st.expander("Get Image Metadata 📷"):
                 st.info("Image Metadata")
                 st.text("Upload JPEG, JPG, PNG Images")
 
         with col2:
-            with st.beta_expander("Get Audio Metadata 🔉"):
+            with st.expander("Get Audio Metadata 🔉"):
                 st.info("Audio Metadata")
                 st.text("Upload Mp3, Ogg")
 
         with col3:
-            with st.beta_expander("Get Document Metadata 📄📁"):
+            with st.expander("Get Document Metadata 📄📁"):
                 st.info("Document Files Metadata")
                 st.text("Upload PDF, Docx")
 
@@ -104,17 +105,19 @@ def main():
         st.subheader("Image MetaData Extraction")
         image_file = st.file_uploader("Upload Image", type=["png", "jpeg", "jpg"])
         if image_file is not None:
+            # Read the upload once, every view below comes from this copy
+            inspection = ImageInspection.from_upload(image_file)
             # UploadFile Class is File-Like Binary Byte
             # st.write(type(image_file))
             # st.write(dir(image_file))
-            with st.beta_expander("File Stats"):
+            with st.expander("File Stats"):
                 file_details = {
                     "FileName": image_file.name,
                     "FileSize": image_file.size,
                     "FileType": image_file.type,
                 }
                 st.write(file_details)
-                st.image(load_image(image_file))
+                st.image(inspection.thumbnail())
 
                 statinfo = os.stat(image_file.readable())
                 st.write(statinfo)
@@ -146,27 +149,15 @@ def main():
                 )
 
             # Layouts
-            c1, c2 = st.beta_columns(2)
+            c1, c2 = st.columns(2)
             with c1:
-                with st.beta_expander("View Image"):
-                    img = load_image(image_file)
-                    st.image(img, width=250)
+                with st.expander("View Image"):
+                    st.image(inspection.thumbnail(250), width=250)
 
             with c2:
-                with st.beta_expander("Default(JPEG)"):
+                with st.expander("Default(JPEG)"):
                     st.info("Using PILLOW")
-                    img = load_image(image_file)
-                    # st.write(dir(img))
-                    img_details = {
-                        "format": img.format,
-                        "format_desc": img.format_description,
-                        "filename": img.filename,
-                        "size": img.size,
-                        "height": img.height,
-                        "width": img.width,
-                        "info": img.info,
-                        "encoder": img.encoderinfo,
-                    }
+                    img_details = inspection.details
                     # st.write(img_details)
                     df_img_details_default = pd.DataFrame(
                         list(img_details.items()), columns=["Meta Tags", "Value"]
@@ -174,12 +165,10 @@ def main():
                     st.dataframe(df_img_details_default)
 
             # Layout For Forensic
-            fcol1, fcol2 = st.beta_columns(2)
+            fcol1, fcol2 = st.columns(2)
             with fcol1:
-                with st.beta_expander("Exifread Tool"):
-                    # img = load_image(image_file)
-                    # st.image(img)
-                    meta_tags = exifread.process_file(image_file)
+                with st.expander("Exifread Tool"):
+                    meta_tags = inspection.exifread_tags
                     # st.write(meta_tags)
 
                     df_img_details_exifread = pd.DataFrame(
@@ -188,40 +177,36 @@ def main():
                     st.dataframe(df_img_details_exifread)
 
             with fcol2:
-                with st.beta_expander("Image GeoCoordinates"):
-                    img_details_with_exif = get_exif(image_file)
-                    try:
-                        gps_info = img_details_with_exif
-                    except:
-                        gps_info = "None Found"
-
+                with st.expander("Image GeoCoordinates"):
+                    gps_info = inspection.gps_info or "None Found"
                     st.write(gps_info)
-                    try:
-                        img_coordinates = get_decimal_coordinates(gps_info)
-                        st.write(img_coordinates)
-                    except:
-                        st.write("None Found")
+                    st.write(inspection.coordinates or "None Found")
 
-            with st.beta_expander("Download Results"):
+            with st.expander("Download Results"):
                 final_df = pd.concat(
                     [df_file_details, df_img_details_default, df_img_details_exifread]
                 )
                 # st.dataframe(final_df)
-                make_downloadable(final_df)
+                make_downloadable(final_df, "metadata_result")
     elif choice == "Audio":
         st.subheader("Audio MetaData Extraction")
 
         # File Upload
-        audio_file = st.file_uploader("Upload Audio", type=["mp3", "ogg"])
+        audio_file = st.file_uploader(
+            "Upload Audio", type=["mp3", "ogg", "oga", "opus", "flac"]
+        )
         if audio_file is not None:
-            # Extraction Process using mutagen
+            # The upload is already in memory, this does not copy it
+            audio_data = audio_file.getvalue()
             # Layouts
-            col1, col2 = st.beta_columns(2)
+            col1, col2 = st.columns(2)
             with col1:
-                st.audio(audio_file.read())
+                # Registered once per file by the media file manager, whose
+                # endpoint answers the player's range requests
+                st.audio(audio_file, format=audio_file.type)
 
             with col2:
-                with st.beta_expander("File Stats"):
+                with st.expander("File Stats"):
                     file_details = {
                         "FileName": audio_file.name,
                         "FileSize": audio_file.size,
@@ -261,21 +246,23 @@ def main():
                         audio_file.size,
                         datetime.now(),
                     )
-            # audio_col1, audio_col2 = st.beta_columns(2)
-            # Extraction Process using mutagen
+            # audio_col1, audio_col2 = st.columns(2)
+            # Extraction Process using mutagen, tag and frame headers only
             # with audio_col1:
-            with st.beta_expander("Metadata with Mutagen"):
-                meta_tags = mutagen.File(audio_file)
+            with st.expander("Audio Metadata"):
+                meta_tags = get_extraction_cache().get_or_extract(
+                    extract_audio_metadata.__name__, audio_data, extract_audio_metadata
+                )
                 # st.write(meta_tags)
-                df_audio_details_with_mutagen = pd.DataFrame(
+                df_audio_details = pd.DataFrame(
                     list(meta_tags.items()), columns=["Meta Tags", "Value"]
                 )
-                st.dataframe(df_file_details)
+                st.dataframe(df_audio_details)
 
-            with st.beta_expander("Download Results"):
-                final_df = pd.concat([df_file_details, df_audio_details_with_mutagen])
+            with st.expander("Download Results"):
+                final_df = pd.concat([df_file_details, df_audio_details])
                 # st.dataframe(final_df)
-                make_downloadable(final_df)
+                make_downloadable(final_df, "metadata_result")
     elif choice == "DocumentFiles":
         st.subheader("DocumentFiles MetaData Extraction")
 
@@ -283,10 +270,10 @@ def main():
         text_file = st.file_uploader("Upload File", type=["PDF"])
         # st.write(dir(text_file))
         if text_file is not None:
-            dcol1, dcol2 = st.beta_columns([1, 2])
+            dcol1, dcol2 = st.columns([1, 2])
 
             with dcol1:
-                with st.beta_expander("File Stats"):
+                with st.expander("File Stats"):
                     file_details = {
                         "FileName": text_file.name,
                         "FileSize": text_file.size,
@@ -325,9 +312,10 @@ def main():
                     )
             # Extraction Process
             with dcol2:
-                with st.beta_expander("Metadata"):
-                    pdf_file = PdfFileReader(text_file)
-                    pdf_info = pdf_file.getDocumentInfo()
+                with st.expander("Metadata"):
+                    pdf_info = get_extraction_cache().get_or_extract(
+                        "pdf_info", text_file.getvalue(), extract_pdf_metadata
+                    )
                     # Convert to DataFrame
                     df_pdf_info = pd.DataFrame(
                         list(pdf_info.items()), columns=["Meta Tags", "Value"]
@@ -335,28 +323,128 @@ def main():
                     st.dataframe(df_pdf_info)
 
             # Download
-            with st.beta_expander("Download Results"):
+            with st.expander("Download Results"):
                 final_df = pd.concat([df_file_details, df_pdf_info])
                 st.dataframe(final_df)
-                make_downloadable(final_df)
+                make_downloadable(final_df, "metadata_result")
+
+    elif choice == "Bulk":
+        st.subheader("Bulk MetaData Extraction")
+
+        # File Upload
+        uploaded_files = st.file_uploader(
+            "Upload Files or Zip Archives",
+            type=["png", "jpeg", "jpg", "mp3", "ogg", "pdf", "zip"],
+            accept_multiple_files=True,
+        )
+        if uploaded_files and st.button("Extract All"):
+            files = [f for f in uploaded_files if not f.name.lower().endswith(".zip")]
+            archives = [f for f in uploaded_files if f.name.lower().endswith(".zip")]
+
+            # Workers read the members of each archive from a temporary copy
+            zip_paths = []
+            for archive in archives:
+                with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as f:
+                    f.write(archive.getvalue())
+                    zip_paths.append(f.name)
+
+            def iter_jobs():
+                yield from iter_upload_jobs(files)
+                for zip_path in zip_paths:
+                    yield from iter_zip_jobs(zip_path)
+
+            status = st.empty()
+            table = st.empty()
+            rows = []
+            num_files = 0
+            last_refresh = 0.0
+            try:
+                for row, meta_tags in bulk_extract(iter_jobs()):
+                    num_files += 1
+                    details = {
+                        "FileName": row["FileName"],
+                        "FileType": row["FileType"],
+                        "FileSize": row["FileSize"],
+                    }
+                    if "Error" in row:
+                        meta_tags = {"Error": row["Error"]}
+                    for key, value in meta_tags.items():
+                        rows.append(dict(details, **{"Meta Tags": key, "Value": value}))
+
+                    # Track Details, unless the file could not even be read
+                    if row["FileSize"] is not None:
+                        add_file_details(
+                            row["FileName"],
+                            row["FileType"],
+                            row["FileSize"],
+                            datetime.now(),
+                        )
+                    status.text("{} files extracted".format(num_files))
+                    if time.monotonic() - last_refresh > TABLE_REFRESH_SECONDS:
+                        table.dataframe(pd.DataFrame(rows))
+                        last_refresh = time.monotonic()
+            finally:
+                for zip_path in zip_paths:
+                    os.remove(zip_path)
+
+            final_df = pd.DataFrame(rows)
+            table.dataframe(final_df)
+            with st.expander("Download Results"):
+                make_downloadable(final_df, "bulk_metadata_result")
 
     elif choice == "Analytics":
         st.subheader("Analytics")
-        all_uploaded_files = view_all_data()
-        df = pd.DataFrame(
-            all_uploaded_files,
-            columns=["FileName", "FileType", "FileSize", "UploadTime"],
-        )
-        # Monitor All Uploads
-        with st.beta_expander("Monitor"):
+        # Monitor Uploads, newest first, one page at a time
+        with st.expander("Monitor"):
             st.success("View All Uploaded Files")
+            cursors = st.session_state.setdefault("monitor_cursors", [None])
+            page_rows, next_cursor = view_page(cursors[-1], MONITOR_PAGE_SIZE)
+            df = pd.DataFrame(
+                page_rows,
+                columns=["Id", "FileName", "FileType", "FileSize", "UploadTime"],
+            )
             st.dataframe(df)
+            st.text("Page {}".format(len(cursors)))
+            pcol1, pcol2 = st.columns(2)
+            with pcol1:
+                if len(cursors) > 1:
+                    st.button("Previous", on_click=cursors.pop)
+            with pcol2:
+                if next_cursor is not None:
+                    st.button("Next", on_click=cursors.append, args=(next_cursor,))
 
         # Stats of Uploaded Files
-        with st.beta_expander("Distribution of FileTypes"):
+        with st.expander("Distribution of FileTypes"):
+            df_types = pd.DataFrame(count_by_filetype(), columns=["FileType", "Count"])
             fig = plt.figure()
-            sns.countplot(df["FileType"])
+            sns.barplot(x="FileType", y="Count", data=df_types)
             st.pyplot(fig)
+
+        with st.expander("Distribution of FileSizes"):
+            size_bins = filesize_histogram()
+            fig = plt.figure()
+            plt.bar(
+                [start for start, _, _ in size_bins],
+                [count for _, _, count in size_bins],
+                width=[end - start for start, end, _ in size_bins],
+                align="edge",
+            )
+            plt.xlabel("FileSize")
+            plt.ylabel("Count")
+            st.pyplot(fig)
+
+        with st.expander("Uploads Over Time"):
+            bucket = st.selectbox("Per", list(TIME_BUCKETS), index=1)
+            df_uploads = pd.DataFrame(
+                uploads_per_bucket(bucket), columns=["Time", "Uploads"]
+            )
+            st.line_chart(df_uploads.set_index("Time"))
+
+        with st.expander("Extraction Cache"):
+            cache_stats = get_extraction_cache().stats
+            st.dataframe(
+                pd.DataFrame(list(cache_stats.items()), columns=["Counter", "Value"])
+            )
     else:
         st.subheader("About")
         # Image
@@ -1,7 +1,8 @@
 from datetime import datetime
-from PIL.ExifTags import TAGS, GPSTAGS
 from PIL import Image
 
+from exif_utils import read_exif
+
 
 def get_readable_time(my_time):
     """Function to get Human Readable Time"""
@@ -10,19 +11,11 @@ def get_readable_time(my_time):
 
 # Forensic MetaData Extraction
 def get_exif(filename):
-    exif = Image.open(filename)._getexif()
-
-    if exif is not None:
-        for key, value in exif.items():
-            name = TAGS.get(key, key)
-            exif[name] = exif.pop(key)
-
-        if "GPSInfo" in exif:
-            for key in exif["GPSInfo"].keys():
-                name = GPSTAGS.get(key, key)
-                exif["GPSInfo"][name] = exif["GPSInfo"].pop(key)
+    """Function to get the named EXIF tags of an image, GPSInfo included.
 
-    return exif
+    Reads only the image header, see exif_utils.read_exif.
+    """
+    return read_exif(filename).tags or None
 
 
 def get_coordinates(info):
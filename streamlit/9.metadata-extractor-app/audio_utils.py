@@ -0,0 +1,87 @@
+# Audio Packages
+import io
+import os
+
+import mutagen
+
+# Most bytes mutagen may read from one file. Its parsers only seek to the
+# tag blocks and a few frame or page headers, so this is enough for cover
+# art while bounding what a corrupt size field can cost
+MAX_READ_BYTES = 32 * 1024 * 1024
+
+
+class ReadLimitError(IOError):
+    """Raised when a file needs more than its read budget"""
+
+
+class BoundedReader(io.RawIOBase):
+    """Read-only view of a seekable binary file that bounds the bytes read.
+
+    Seeks are free, so the header parsers of mutagen can jump to the end
+    of the file for an ID3v1 tag or the last Ogg page without reading
+    what lies between.
+    """
+
+    def __init__(self, f, max_bytes=MAX_READ_BYTES):
+        self._f = f
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._f.seek(offset, whence)
+
+    def tell(self):
+        return self._f.tell()
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.max_bytes - self.bytes_read + 1)
+        data = self._f.read(size)
+        self.bytes_read += len(data)
+        if self.bytes_read > self.max_bytes:
+            raise ReadLimitError(
+                "more than {} bytes read from the file".format(self.max_bytes)
+            )
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def read_audio_file(source, max_bytes=MAX_READ_BYTES):
+    """Function to get the mutagen FileType of audio, or None if unknown.
+
+    source is the audio bytes, a file path or a seekable binary file
+    object. Any container mutagen knows (MP3, Ogg Vorbis, Opus, FLAC,
+    MP4...) is read through a BoundedReader, and nothing is decoded.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return read_audio_file(io.BytesIO(source), max_bytes)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return read_audio_file(f, max_bytes)
+    source.seek(0)
+    try:
+        return mutagen.File(BoundedReader(source, max_bytes))
+    finally:
+        source.seek(0)
+
+
+def get_audio_details(audio):
+    """Function to get the stream details of a mutagen FileType as a dict.
+
+    Duration is in seconds and bitrate in bits per second, None where the
+    format does not give them.
+    """
+    info = audio.info
+    length = getattr(info, "length", None)
+    return {
+        "Format": type(audio).__name__,
+        "Duration": round(length, 2) if length else None,
+        "Bitrate": getattr(info, "bitrate", None) or None,
+        "SampleRate": getattr(info, "sample_rate", None),
+        "Channels": getattr(info, "channels", None),
+    }
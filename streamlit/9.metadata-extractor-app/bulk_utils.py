@@ -0,0 +1,158 @@
+# Bulk Extraction Packages
+import mimetypes
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import islice
+
+from extract_utils import get_extractor
+from filecache_utils import get_extraction_cache
+
+# Worker processes for bulk extraction, set METADATA_WORKERS to change
+MAX_WORKERS = int(os.environ.get("METADATA_WORKERS", os.cpu_count() or 1))
+
+# Files extracted per pool task, so small files do not pay a round trip each
+FILES_PER_TASK = 32
+
+# Tasks handed to the pool per worker before waiting for results, so a huge
+# archive is never read into memory all at once
+TASKS_PER_WORKER = 2
+
+
+@lru_cache(maxsize=1)
+def get_executor():
+    """Function to get the process pool shared by every rerun and session"""
+    return ProcessPoolExecutor(max_workers=MAX_WORKERS)
+
+
+def reset_executor(executor):
+    """Function to drop a broken pool, so get_executor starts a new one"""
+    if get_executor() is executor:
+        get_executor.cache_clear()
+    executor.shutdown(wait=False)
+
+
+def get_mime_type(filename):
+    """Function to guess the MIME type of a file name, as browsers report it"""
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def get_job_size(source, filename):
+    """Function to get the size in bytes of a job's file, None if unknown"""
+    if not isinstance(source, str):
+        return len(source)
+    try:
+        with zipfile.ZipFile(source) as archive:
+            return archive.getinfo(filename).file_size
+    except Exception:
+        return None
+
+
+def get_error_row(job, error):
+    """Function to get the row of a job whose file could not be extracted"""
+    source, filename, file_type = job
+    row = {
+        "FileName": filename,
+        "FileType": file_type,
+        "FileSize": get_job_size(source, filename),
+        "Error": "{}: {}".format(type(error).__name__, error),
+    }
+    return row, {}
+
+
+def extract_file(data, filename, file_type):
+    """Function to extract the metadata of one file's bytes.
+
+    Returns a row with the file details and the tags as strings. A file
+    that fails to parse gets an Error entry instead of tags. Tags come from
+    the extraction cache when the same bytes were extracted before.
+    """
+    extractor, _ = get_extractor(filename)
+    row = {"FileName": filename, "FileType": file_type, "FileSize": len(data)}
+    try:
+        meta_tags = get_extraction_cache().get_or_extract(
+            extractor.__name__, data, extractor
+        )
+    except Exception as e:
+        row["Error"] = "{}: {}".format(type(e).__name__, e)
+        return row, {}
+    return row, {str(key): str(value) for key, value in meta_tags.items()}
+
+
+def extract_files(jobs):
+    """Function run in a worker: extract the metadata of a batch of files.
+
+    Each job is (source, filename, file_type), where source is the file
+    bytes or the path of the zip archive holding filename and file_type its
+    MIME type. Archives are opened once per batch and read by the worker
+    itself. A member that cannot be read gets an Error row.
+    """
+    archives = {}
+    results = []
+    try:
+        for job in jobs:
+            source, filename, file_type = job
+            if isinstance(source, str):
+                try:
+                    if source not in archives:
+                        archives[source] = zipfile.ZipFile(source)
+                    source = archives[source].read(filename)
+                except Exception as e:
+                    results.append(get_error_row(job, e))
+                    continue
+            results.append(extract_file(source, filename, file_type))
+    finally:
+        for archive in archives.values():
+            archive.close()
+    return results
+
+
+def iter_zip_jobs(zip_path):
+    """Function to get the (zip_path, filename, file_type) jobs of a zip archive"""
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and get_extractor(info.filename)[0] is not None:
+                yield zip_path, info.filename, get_mime_type(info.filename)
+
+
+def iter_upload_jobs(uploaded_files):
+    """Function to get the (bytes, filename, file_type) jobs of uploaded files"""
+    for uploaded_file in uploaded_files:
+        if get_extractor(uploaded_file.name)[0] is not None:
+            yield uploaded_file.getvalue(), uploaded_file.name, uploaded_file.type
+
+
+def bulk_extract(jobs):
+    """Function to extract the metadata of many files on the process pool.
+
+    jobs yields (source, filename, file_type) triples, see extract_files.
+    Yields (row, meta_tags) as workers finish, in completion order. At most
+    TASKS_PER_WORKER batches per worker are in flight at any time. If a
+    batch fails, its files get Error rows. If a worker crashes, the
+    remaining jobs also go to a new pool.
+    """
+    executor = get_executor()
+    max_pending = MAX_WORKERS * TASKS_PER_WORKER
+    batches = {}
+    jobs = iter(jobs)
+    while True:
+        while len(batches) < max_pending:
+            batch = list(islice(jobs, FILES_PER_TASK))
+            if not batch:
+                break
+            batches[executor.submit(extract_files, batch)] = batch
+        if not batches:
+            return
+        done, _ = wait(batches, return_when=FIRST_COMPLETED)
+        for future in done:
+            batch = batches.pop(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    reset_executor(executor)
+                    executor = get_executor()
+                results = [get_error_row(job, e) for job in batch]
+            yield from results
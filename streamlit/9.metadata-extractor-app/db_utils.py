@@ -1,38 +1,392 @@
 # Database Management
+import atexit
+import logging
+import os
+import queue
 import sqlite3
+import threading
+import time
 
-conn = sqlite3.connect("data.db")
-c = conn.cursor()
+# SQLite file of the upload tracking store, set METADATA_DB_PATH to change
+DB_PATH = os.environ.get("METADATA_DB_PATH", "data.db")
+
+# Rows committed together by the writer, and the longest a row waits
+WRITE_BATCH_SIZE = 500
+WRITE_DELAY_SECONDS = 0.05
+
+# Seconds a connection waits on a lock held by another process
+BUSY_TIMEOUT_SECONDS = 30
+
+# Longest a read waits for queued rows before it goes on without them
+FLUSH_TIMEOUT_SECONDS = 10
+
+# Keep per filetype and day totals up to date on insert, set
+# METADATA_ROLLUP=0 to turn off
+USE_ROLLUP = os.environ.get("METADATA_ROLLUP", "1") == "1"
+
+# strftime formats of the time buckets of uploads_per_bucket
+TIME_BUCKETS = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "month": "%Y-%m"}
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = False
+_writer_lock = threading.Lock()
+_writer = None
+
+
+def _connect():
+    """Function to open a connection in WAL mode, so readers never block writers"""
+    conn = sqlite3.connect(DB_PATH, timeout=BUSY_TIMEOUT_SECONDS)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def get_connection():
+    """Function to get the connection of the calling thread"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        create_uploaded_file_table()
+        conn = _local.conn = _connect()
+    return conn
 
 
 # Table
 def create_uploaded_file_table():
-    c.execute(
+    """Function to create the table and its indexes, once per process"""
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    """
+                CREATE TABLE IF NOT EXISTS files_table(filename TEXT,
+                filetype TEXT, filesize TEXT, upload_date TIMESTAMP)
+                """
+                )
+                conn.execute(
+                    """
+                CREATE INDEX IF NOT EXISTS files_table_upload_date
+                ON files_table(upload_date)
+                """
+                )
+                conn.execute(
+                    """
+                CREATE INDEX IF NOT EXISTS files_table_filetype
+                ON files_table(filetype, upload_date)
+                """
+                )
+                if USE_ROLLUP:
+                    _create_rollup_table(conn)
+        finally:
+            conn.close()
+        _schema_ready = True
+
+
+def _create_rollup_table(conn):
+    """Function to create the rollup table and reconcile it with the uploads.
+
+    files_rollup_state holds the highest files_table rowid the rollup
+    covers. When it differs from the table's, or the rollup's file count
+    differs from the table's row count (rows written or removed while
+    METADATA_ROLLUP=0), the rollup is rebuilt from files_table.
+    """
+    conn.execute(
+        """
+    CREATE TABLE IF NOT EXISTS files_rollup(filetype TEXT, day TEXT,
+    num_files INTEGER, total_size INTEGER, PRIMARY KEY (filetype, day))
+    """
+    )
+    conn.execute(
+        """
+    CREATE TABLE IF NOT EXISTS files_rollup_state(
+    id INTEGER PRIMARY KEY CHECK (id = 0), last_rowid INTEGER)
+    """
+    )
+    state = conn.execute("SELECT last_rowid FROM files_rollup_state").fetchone()
+    num_files, last_rowid = conn.execute(
+        """
+    SELECT COUNT(*), COALESCE(MAX(rowid), 0) FROM files_table
+    """
+    ).fetchone()
+    (rollup_files,) = conn.execute(
+        """
+    SELECT COALESCE(SUM(num_files), 0) FROM files_rollup
+    """
+    ).fetchone()
+    if state is None or state[0] != last_rowid or rollup_files != num_files:
+        _rebuild_rollup(conn, last_rowid)
+
+
+def _rebuild_rollup(conn, last_rowid):
+    """Function to refill the rollup table from every upload"""
+    conn.execute("DELETE FROM files_rollup")
+    conn.execute(
         """
-    CREATE TABLE IF NOT EXISTS files_table(filename TEXT, 
-    filetype TEXT, filesize TEXT, upload_date TIMESTAMP)
+    INSERT INTO files_rollup(filetype, day, num_files, total_size)
+    SELECT filetype, strftime('%Y-%m-%d', upload_date), COUNT(*),
+    SUM(CAST(filesize AS INTEGER)) FROM files_table
+    GROUP BY filetype, strftime('%Y-%m-%d', upload_date)
     """
     )
+    conn.execute(
+        """
+    INSERT OR REPLACE INTO files_rollup_state(id, last_rowid) VALUES (0, ?)
+    """,
+        (last_rowid,),
+    )
 
 
-# Adding Details
-def add_file_details(filename, filetype, filesize, upload_date):
-    c.execute(
-        f"""
-    INSERT INTO files_table(filename, filetype, filesize, upload_date)
+def _to_size(filesize):
+    try:
+        return int(filesize)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _update_rollup(conn, rows):
+    """Function to add a batch of inserted rows to the rollup table"""
+    totals = {}
+    for _, filetype, filesize, upload_date in rows:
+        key = (filetype, str(upload_date)[:10])
+        num_files, total_size = totals.get(key, (0, 0))
+        totals[key] = (num_files + 1, total_size + _to_size(filesize))
+    conn.executemany(
+        """
+    INSERT INTO files_rollup(filetype, day, num_files, total_size)
     VALUES (?, ?, ?, ?)
+    ON CONFLICT(filetype, day) DO UPDATE SET
+    num_files = num_files + excluded.num_files,
+    total_size = total_size + excluded.total_size
     """,
-        (filename, filetype, filesize, upload_date),
+        [key + value for key, value in totals.items()],
+    )
+    conn.execute(
+        """
+    UPDATE files_rollup_state SET last_rowid = (SELECT MAX(rowid) FROM files_table)
+    """
     )
-    conn.commit()
+
+
+class BatchWriter:
+    """Background thread inserting queued rows, many per transaction.
+
+    Sessions only enqueue their rows. The writer takes up to
+    WRITE_BATCH_SIZE rows, waiting at most WRITE_DELAY_SECONDS for more,
+    and commits them together, so concurrent uploads share one fsync
+    instead of contending for the write lock.
+    """
+
+    def __init__(self, batch_size=WRITE_BATCH_SIZE, delay=WRITE_DELAY_SECONDS):
+        self.batch_size = batch_size
+        self.delay = delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="upload-writer", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, row):
+        self._queue.put(row)
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def flush(self, timeout=FLUSH_TIMEOUT_SECONDS):
+        """Wait until every queued row is committed.
+
+        Returns False instead of waiting forever when the writer thread has
+        died or the rows are not committed within timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.is_alive():
+                    return False
+                # Wake up now and then to notice a dead writer
+                self._queue.all_tasks_done.wait(min(remaining, 1.0))
+        return True
+
+    def drain(self):
+        """Remove and return the rows still queued, e.g. of a dead writer"""
+        rows = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _next_batch(self):
+        rows = [self._queue.get()]
+        deadline = time.monotonic() + self.delay
+        while len(rows) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                rows.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self):
+        conn = None
+        while True:
+            rows = self._next_batch()
+            # Every row is marked done whatever happens, so flush never
+            # waits on rows that will not be written
+            try:
+                if conn is None:
+                    conn = get_connection()
+                with conn:
+                    conn.executemany(
+                        """
+                    INSERT INTO files_table(filename, filetype, filesize, upload_date)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                        rows,
+                    )
+                    if USE_ROLLUP:
+                        _update_rollup(conn, rows)
+            except Exception:
+                logger.exception("Could not write %d upload rows", len(rows))
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+
+def get_writer():
+    """Function to get the process-wide BatchWriter, started on first use.
+
+    A writer whose thread has died is replaced, and its queued rows are
+    handed to the new one.
+    """
+    global _writer
+    if _writer is None or not _writer.is_alive():
+        with _writer_lock:
+            if _writer is None:
+                atexit.register(flush_file_details)
+            if _writer is None or not _writer.is_alive():
+                old_writer, _writer = _writer, BatchWriter()
+                if old_writer is not None:
+                    for row in old_writer.drain():
+                        _writer.put(row)
+    return _writer
+
+
+# Adding Details
+def add_file_details(filename, filetype, filesize, upload_date):
+    get_writer().put((filename, filetype, filesize, upload_date))
+
+
+def flush_file_details():
+    """Function to wait until every added detail is in the database.
+
+    Reads go on with what is committed if the writer is dead or slow.
+    """
+    if _writer is not None and not _writer.flush():
+        logger.warning("Reading before every upload row is written")
 
 
 # View Details
 def view_all_data():
-    c.execute(
+    flush_file_details()
+    c = get_connection().execute(
         """
     SELECT * FROM files_table
     """
     )
     data = c.fetchall()
     return data
+
+
+# Page of Details, newest first
+def view_page(before=None, page_size=100):
+    """Function to get one page of uploads by keyset pagination.
+
+    Returns the rows (rowid first) and the cursor of the next page, None on
+    the last one. Each page is a range scan on rowid, however deep it is.
+    """
+    flush_file_details()
+    if before is None:
+        before = 2**63 - 1
+    c = get_connection().execute(
+        """
+    SELECT rowid, filename, filetype, filesize, upload_date FROM files_table
+    WHERE rowid < ? ORDER BY rowid DESC LIMIT ?
+    """,
+        (before, page_size + 1),
+    )
+    data = c.fetchall()
+    if len(data) > page_size:
+        return data[:page_size], data[page_size - 1][0]
+    return data, None
+
+
+# Aggregates
+def count_by_filetype():
+    """Function to get (filetype, count) pairs, most common first"""
+    flush_file_details()
+    if USE_ROLLUP:
+        query = """
+    SELECT filetype, SUM(num_files) AS n FROM files_rollup
+    GROUP BY filetype ORDER BY n DESC
+    """
+    else:
+        query = """
+    SELECT filetype, COUNT(*) AS n FROM files_table
+    GROUP BY filetype ORDER BY n DESC
+    """
+    return get_connection().execute(query).fetchall()
+
+
+def filesize_histogram(num_bins=20):
+    """Function to get (bin_start, bin_end, count) rows of the file sizes"""
+    flush_file_details()
+    conn = get_connection()
+    low, high = conn.execute(
+        """
+    SELECT MIN(CAST(filesize AS INTEGER)), MAX(CAST(filesize AS INTEGER))
+    FROM files_table WHERE filesize IS NOT NULL
+    """
+    ).fetchone()
+    if low is None:
+        return []
+    width = (high - low) // num_bins + 1
+    c = conn.execute(
+        """
+    SELECT (CAST(filesize AS INTEGER) - ?) / ? AS bin, COUNT(*) FROM files_table
+    WHERE filesize IS NOT NULL GROUP BY bin ORDER BY bin
+    """,
+        (low, width),
+    )
+    return [(low + b * width, low + (b + 1) * width, n) for b, n in c.fetchall()]
+
+
+def uploads_per_bucket(bucket="day"):
+    """Function to get (time_bucket, count) pairs in time order.
+
+    bucket is one of TIME_BUCKETS. Days and months are read from the
+    rollup table when it is on.
+    """
+    flush_file_details()
+    time_format = TIME_BUCKETS[bucket]
+    if USE_ROLLUP and bucket != "hour":
+        query = """
+    SELECT strftime(?, day) AS bucket, SUM(num_files) FROM files_rollup
+    GROUP BY bucket ORDER BY bucket
+    """
+    else:
+        query = """
+    SELECT strftime(?, upload_date) AS bucket, COUNT(*) FROM files_table
+    GROUP BY bucket ORDER BY bucket
+    """
+    return get_connection().execute(query, (time_format,)).fetchall()
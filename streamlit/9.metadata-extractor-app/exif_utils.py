@@ -0,0 +1,197 @@
+# EXIF Packages
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from PIL.ExifTags import GPSTAGS, TAGS
+
+# EXIF pointers to the Exif and GPS sub-IFDs
+EXIF_IFD = 0x8769
+GPS_IFD = 0x8825
+
+# Bytes read from the start of a file object, enough for any JPEG APP1
+# segment (at most 64 KiB) and the segments before it
+MAX_HEADER_BYTES = 256 * 1024
+
+# Tag names indexed by tag number, so naming a tag is one array lookup
+TAG_NAMES = tuple(TAGS.get(tag, tag) for tag in range(0x10000))
+GPS_TAG_NAMES = tuple(GPSTAGS.get(tag, tag) for tag in range(0x100))
+
+# Size in bytes and struct code of each TIFF field type, indexed by type
+TYPE_SIZES = (0, 1, 1, 2, 4, 8, 1, 1, 2, 4, 8, 4, 8)
+TYPE_CODES = ("", "B", "s", "H", "L", "L", "b", "s", "h", "l", "l", "f", "d")
+BYTE, ASCII, RATIONAL, UNDEFINED, SRATIONAL = 1, 2, 5, 7, 10
+
+# IFD entries: tag, type, count, value or offset
+ENTRY = {"<": struct.Struct("<HHL"), ">": struct.Struct(">HHL")}
+
+JPEG_SOI = b"\xff\xd8"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+TIFF_HEADERS = (b"II*\x00", b"MM\x00*")
+
+ExifData = namedtuple("ExifData", ["tags", "gps_info", "coordinates"])
+
+
+def _find_tiff(buf):
+    """Function to get the offset of the TIFF header holding the EXIF, or None.
+
+    Walks the JPEG segments up to the first APP1 Exif one, the PNG chunks up
+    to eXIf, and takes TIFF based files (most RAW formats) as they are.
+    Image data is never reached.
+    """
+    if buf[:2] == JPEG_SOI:
+        pos = 2
+        while pos + 4 <= len(buf) and buf[pos] == 0xFF:
+            marker = buf[pos + 1]
+            if marker == 0xFF:
+                pos += 1
+                continue
+            if marker in (0xD9, 0xDA):
+                return None
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                pos += 2
+                continue
+            (length,) = struct.unpack_from(">H", buf, pos + 2)
+            if marker == 0xE1 and buf[pos + 4 : pos + 10] == b"Exif\x00\x00":
+                return pos + 10
+            pos += 2 + length
+        return None
+    if buf[:8] == PNG_SIGNATURE:
+        pos = 8
+        while pos + 8 <= len(buf):
+            length, chunk_type = struct.unpack_from(">L4s", buf, pos)
+            if chunk_type == b"eXIf":
+                return pos + 8
+            if chunk_type in (b"IDAT", b"IEND"):
+                return None
+            pos += 12 + length
+        return None
+    if buf[:4] in TIFF_HEADERS:
+        return 0
+    return None
+
+
+def _read_ifd(buf, base, offset, endian):
+    """Function to get the {tag: value} entries of the IFD at base + offset"""
+    start = base + offset
+    if offset <= 0 or start + 2 > len(buf):
+        return {}
+    (count,) = struct.unpack_from(endian + "H", buf, start)
+    count = min(count, (len(buf) - start - 2) // 12)
+    entry = ENTRY[endian]
+    entries = {}
+    for pos in range(start + 2, start + 2 + 12 * count, 12):
+        tag, field_type, num = entry.unpack_from(buf, pos)
+        if not 0 < field_type < len(TYPE_SIZES):
+            continue
+        size = TYPE_SIZES[field_type] * num
+        if size <= 4:
+            data_pos = pos + 8
+        else:
+            (data_offset,) = struct.unpack_from(endian + "L", buf, pos + 8)
+            data_pos = base + data_offset
+            if data_pos + size > len(buf):
+                continue
+        raw = bytes(buf[data_pos : data_pos + size])
+
+        if field_type == ASCII:
+            value = raw.split(b"\x00", 1)[0].decode("utf-8", "replace")
+        elif field_type in (BYTE, UNDEFINED):
+            # Raw bytes, as Pillow returns them
+            value = raw
+        else:
+            code = TYPE_CODES[field_type]
+            if field_type in (RATIONAL, SRATIONAL):
+                numbers = struct.unpack("{}{}{}".format(endian, 2 * num, code), raw)
+                value = tuple(zip(numbers[::2], numbers[1::2]))
+            else:
+                value = struct.unpack("{}{}{}".format(endian, num, code), raw)
+            if num == 1:
+                value = value[0]
+        entries[tag] = value
+    return entries
+
+
+def _parse_tiff(buf, base):
+    """Function to get the IFD0 + Exif IFD and the GPS IFD entries by number"""
+    byte_order = bytes(buf[base : base + 2])
+    if byte_order == b"II":
+        endian = "<"
+    elif byte_order == b"MM":
+        endian = ">"
+    else:
+        return {}, {}
+    if base + 8 > len(buf):
+        return {}, {}
+    magic, ifd0_offset = struct.unpack_from(endian + "HL", buf, base + 2)
+    if magic != 42:
+        return {}, {}
+
+    entries = _read_ifd(buf, base, ifd0_offset, endian)
+    if isinstance(entries.get(EXIF_IFD), int):
+        entries.update(_read_ifd(buf, base, entries[EXIF_IFD], endian))
+    gps_entries = {}
+    if isinstance(entries.get(GPS_IFD), int):
+        gps_entries = _read_ifd(buf, base, entries[GPS_IFD], endian)
+    return entries, gps_entries
+
+
+def _to_degrees(value, ref):
+    """Function to get signed decimal degrees from EXIF (num, den) triplets"""
+    if not isinstance(value, tuple) or len(value) != 3:
+        return None
+    degrees = 0.0
+    for scale, (numerator, denominator) in zip((1, 60, 3600), value):
+        if denominator == 0:
+            return None
+        degrees += numerator / denominator / scale
+    return -degrees if ref in ("S", "W") else degrees
+
+
+def parse_exif(buf):
+    """Function to get the ExifData of an image held in a bytes-like buffer"""
+    base = _find_tiff(buf)
+    if base is None:
+        return ExifData({}, {}, None)
+    try:
+        entries, gps_entries = _parse_tiff(buf, base)
+    except struct.error:
+        return ExifData({}, {}, None)
+
+    gps_info = {
+        (GPS_TAG_NAMES[tag] if tag < len(GPS_TAG_NAMES) else tag): value
+        for tag, value in gps_entries.items()
+    }
+    tags = {TAG_NAMES[tag]: value for tag, value in entries.items()}
+    if gps_info:
+        tags["GPSInfo"] = gps_info
+
+    coordinates = None
+    latitude = _to_degrees(gps_entries.get(2), gps_entries.get(1))
+    longitude = _to_degrees(gps_entries.get(4), gps_entries.get(3))
+    if latitude is not None and longitude is not None:
+        coordinates = [latitude, longitude]
+    return ExifData(tags, gps_info, coordinates)
+
+
+def read_exif(source):
+    """Function to get the ExifData of an image without decoding it.
+
+    source is the image bytes, a file path, which is memory-mapped so only
+    the header pages are read, or a binary file object, of which at most
+    MAX_HEADER_BYTES are read. Rationals are (num, den) pairs and GPS
+    coordinates come as decimal degrees.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return parse_exif(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ExifData({}, {}, None)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return parse_exif(buf)
+    source.seek(0)
+    header = source.read(MAX_HEADER_BYTES)
+    source.seek(0)
+    return parse_exif(header)
@@ -0,0 +1,57 @@
+# Extraction Packages
+import io
+import os
+
+from PIL import Image
+from audio_utils import get_audio_details, read_audio_file
+from exif_utils import parse_exif
+from pdf_utils import get_pdf_info
+
+IMAGE_EXTENSIONS = (".png", ".jpeg", ".jpg")
+AUDIO_EXTENSIONS = (".mp3", ".ogg", ".oga", ".opus", ".flac")
+PDF_EXTENSIONS = (".pdf",)
+
+
+def extract_image_metadata(data):
+    """Function to get the Pillow header details and EXIF tags of image bytes"""
+    with Image.open(io.BytesIO(data)) as img:
+        meta_tags = {
+            "format": img.format,
+            "size": img.size,
+            "height": img.height,
+            "width": img.width,
+        }
+        meta_tags.update(img.info)
+    meta_tags.pop("exif", None)
+    exif_data = parse_exif(data)
+    meta_tags.update(exif_data.tags)
+    if exif_data.coordinates:
+        meta_tags["Latitude"], meta_tags["Longitude"] = exif_data.coordinates
+    return meta_tags
+
+
+def extract_audio_metadata(data):
+    """Function to get the tags and stream details of audio bytes"""
+    audio = read_audio_file(data)
+    if audio is None:
+        return {}
+    meta_tags = dict(audio.items())
+    meta_tags.update(get_audio_details(audio))
+    return meta_tags
+
+
+def extract_pdf_metadata(data):
+    """Function to get the document info of PDF bytes"""
+    return get_pdf_info(io.BytesIO(data))
+
+
+def get_extractor(filename):
+    """Function to get the extraction function and file type of a file name"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return extract_image_metadata, "image"
+    if extension in AUDIO_EXTENSIONS:
+        return extract_audio_metadata, "audio"
+    if extension in PDF_EXTENSIONS:
+        return extract_pdf_metadata, "pdf"
+    return None, None
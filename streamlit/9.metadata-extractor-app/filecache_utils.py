@@ -0,0 +1,184 @@
+# File Cache Packages
+import hashlib
+import logging
+import os
+import pickle
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+# Directory of the on-disk tier, set EXTRACT_CACHE_DIR to change
+CACHE_DIR = os.environ.get("EXTRACT_CACHE_DIR", ".extract_cache")
+
+# Size bounds of the memory and disk tiers, in bytes of pickled results
+MAX_MEMORY_BYTES = int(os.environ.get("EXTRACT_CACHE_MEMORY", 64 * 1024 * 1024))
+MAX_DISK_BYTES = int(os.environ.get("EXTRACT_CACHE_DISK", 512 * 1024 * 1024))
+
+# Characters of a key kept in its file name
+UNSAFE_CHARS = re.compile(r"[^\w.-]")
+
+logger = logging.getLogger(__name__)
+
+
+def get_content_hash(data):
+    """Function to get the BLAKE2 hash of a file's bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ExtractionCache:
+    """Two-tier cache of extraction results keyed by the content of the file.
+
+    Results are stored under the extractor name and the BLAKE2 hash of the
+    file bytes, so a rerun, another session or a renamed copy of the same
+    file never extracts it again. The memory tier is an LRU bounded by
+    max_memory_bytes. Every result is also pickled to cache_dir, where the
+    least recently used files are removed past max_disk_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir=CACHE_DIR,
+        max_memory_bytes=MAX_MEMORY_BYTES,
+        max_disk_bytes=MAX_DISK_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = self.disk_hits = self.misses = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """Hit and miss counters and the size of each tier"""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._entries),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def get_or_extract(self, name, data, extract):
+        """Return extract(data), computed only if no tier holds it yet"""
+        key = "{}-{}".format(name, get_content_hash(data))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+
+        payload = self._read_disk(key)
+        if payload is not None:
+            value = pickle.loads(payload)
+            with self._lock:
+                self.disk_hits += 1
+            self._put_memory(key, value, len(payload))
+            return value
+
+        value = extract(data)
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Kept out of both tiers, it is extracted again next time
+            logger.warning("Result of %s cannot be cached", name)
+            payload = None
+        with self._lock:
+            self.misses += 1
+        if payload is not None:
+            self._put_memory(key, value, len(payload))
+            self._write_disk(key, payload)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def _put_memory(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (value, size)
+            self._memory_bytes += size
+            # Always keep the newest result, even if it alone exceeds the bound
+            while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._memory_bytes -= old_size
+
+    def _disk_path(self, key):
+        file_name = UNSAFE_CHARS.sub("_", key)
+        return os.path.join(self.cache_dir, "{}.pickle".format(file_name))
+
+    def _disk_entries(self):
+        """Yield (path, size, last_used) of each file of the disk tier"""
+        if self.cache_dir is None:
+            return
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pickle"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+            # The modification time marks the last use for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return payload
+
+    def _write_disk(self, key, payload):
+        if self.cache_dir is None or len(payload) > self.max_disk_bytes:
+            return
+        # Written to a temporary file and renamed, so readers in other
+        # processes never see a partial result
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, self._disk_path(key))
+        with self._lock:
+            self._disk_bytes += len(payload)
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove the least recently used files until the tier fits its bound"""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        disk_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if disk_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            disk_bytes -= size
+        self._disk_bytes = disk_bytes
+
+
+@lru_cache(maxsize=1)
+def get_extraction_cache():
+    """Function to get the cache shared by every rerun and session"""
+    return ExtractionCache()
@@ -0,0 +1,94 @@
+# Image Inspection Packages
+import io
+from functools import cached_property
+
+import exifread
+from PIL import Image
+
+from exif_utils import read_exif
+from filecache_utils import get_extraction_cache
+
+# Largest side of the preview thumbnail
+THUMBNAIL_SIZE = 600
+
+
+class ImageInspection:
+    """Metadata of one image, all read from a single in-memory copy.
+
+    The bytes are read once. Pillow only parses the header when the image
+    is opened, EXIF and GPS come from a header-only parser, pixels are
+    decoded for the thumbnail alone, and every view is computed on first use.
+    EXIF results are kept in the extraction cache under the content hash.
+    """
+
+    def __init__(self, data, filename=None):
+        self.data = data
+        self.filename = filename
+
+    @classmethod
+    def from_upload(cls, uploaded_file):
+        return cls(uploaded_file.getvalue(), uploaded_file.name)
+
+    @cached_property
+    def image(self):
+        """The Pillow image, with only its header parsed"""
+        return Image.open(io.BytesIO(self.data))
+
+    @cached_property
+    def details(self):
+        img = self.image
+        return {
+            "format": img.format,
+            "format_desc": img.format_description,
+            "filename": self.filename,
+            "size": img.size,
+            "height": img.height,
+            "width": img.width,
+            "info": img.info,
+            "encoder": getattr(img, "encoderinfo", None),
+        }
+
+    @cached_property
+    def exif_data(self):
+        """EXIF tags, GPS tags and coordinates, parsed from the header only"""
+        return get_extraction_cache().get_or_extract("exif", self.data, read_exif)
+
+    @property
+    def exif(self):
+        """EXIF tags by name, with the Exif IFD merged in and GPSInfo by name"""
+        return self.exif_data.tags
+
+    @property
+    def gps_info(self):
+        return self.exif_data.gps_info
+
+    @property
+    def coordinates(self):
+        """[latitude, longitude] in decimal degrees, or None"""
+        return self.exif_data.coordinates
+
+    @cached_property
+    def exifread_tags(self):
+        return get_extraction_cache().get_or_extract(
+            "exifread", self.data, lambda data: exifread.process_file(io.BytesIO(data))
+        )
+
+    @cached_property
+    def preview(self):
+        """The image decoded once, at most THUMBNAIL_SIZE pixels a side.
+
+        JPEGs are decoded at a reduced scale through Pillow's draft mode, so
+        the full resolution is never held in memory.
+        """
+        img = Image.open(io.BytesIO(self.data))
+        img.draft("RGB", (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        img.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        return img
+
+    def thumbnail(self, size=THUMBNAIL_SIZE):
+        """Return the image at most size pixels a side, scaled from the preview"""
+        if size >= THUMBNAIL_SIZE:
+            return self.preview
+        img = self.preview.copy()
+        img.thumbnail((size, size))
+        return img